@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Signal backtesting against local price history
+Joins stored buy/sell/hold signals with OHLC bars per stock and measures
+forward returns, hit rates and performance by confidence bucket. All joins
+and aggregations are vectorized pandas operations.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from typing import List, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_HORIZONS = [1, 5, 20]
+CONFIDENCE_BINS = [0, 50, 60, 70, 80, 90, 100]
+SIGNAL_DIRECTION = {"buy": 1.0, "sell": -1.0, "hold": 0.0}
+
+
+def normalize_symbols(names: pd.Series) -> pd.Series:
+    """Key used to match signal stock names with price file names"""
+    return names.astype(str).str.upper().str.replace(r"[^A-Z0-9]", "", regex=True)
+
+
+def _read_table(path: str) -> pd.DataFrame:
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def _to_naive_datetime(values: pd.Series) -> pd.Series:
+    times = pd.to_datetime(values, errors="coerce", utc=True)
+    # One resolution for both sides, merge_asof refuses mixed units
+    return times.dt.tz_localize(None).astype("datetime64[ns]")
+
+
+def load_prices(path: str) -> pd.DataFrame:
+    """Load OHLC bars from a directory of <SYMBOL>.csv/.parquet files or one combined file
+
+    Combined files need a symbol column; either layout needs a date (or
+    timestamp) column and a close column.
+    """
+    if os.path.isdir(path):
+        frames = []
+        for file_path in sorted(glob.glob(os.path.join(path, "*.csv")) + glob.glob(os.path.join(path, "*.parquet"))):
+            frame = _read_table(file_path)
+            frame.columns = [str(c).lower() for c in frame.columns]
+            if "symbol" not in frame.columns:
+                frame["symbol"] = os.path.splitext(os.path.basename(file_path))[0]
+            frames.append(frame)
+        if not frames:
+            raise ValueError(f"No price files found in {path}")
+        prices = pd.concat(frames, ignore_index=True)
+    else:
+        prices = _read_table(path)
+        prices.columns = [str(c).lower() for c in prices.columns]
+
+    time_column = "timestamp" if "timestamp" in prices.columns else "date"
+    prices = pd.DataFrame({
+        "symbol": normalize_symbols(prices["symbol"]),
+        "time": _to_naive_datetime(prices[time_column]),
+        "close": pd.to_numeric(prices["close"], errors="coerce"),
+    }).dropna()
+    return prices.sort_values(["symbol", "time"], ignore_index=True)
+
+
+def load_signals(path: str, symbol_map: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """Load signals from JSONL (bulk_analyze output), JSON or Parquet"""
+    if path.endswith(".parquet") or os.path.isdir(path):
+        signals = pd.read_parquet(path)
+    elif path.endswith(".jsonl"):
+        signals = pd.read_json(path, lines=True)
+    else:
+        with open(path) as f:
+            data = json.load(f)
+        signals = pd.DataFrame(data.get("signals", data) if isinstance(data, dict) else data)
+
+    if "error" in signals.columns:
+        signals = signals[signals["error"].isna()]
+    stocks = signals["stock"].astype(str)
+    if symbol_map:
+        stocks = stocks.map(symbol_map).fillna(stocks)
+    return pd.DataFrame({
+        "stock": signals["stock"].astype(str),
+        "symbol": normalize_symbols(stocks),
+        "time": _to_naive_datetime(signals["timestamp"]),
+        "signal": signals["signal"].astype(str).str.lower(),
+        "confidence": pd.to_numeric(signals["confidence"], errors="coerce"),
+    }).dropna(subset=["time", "confidence"])
+
+
+def forward_returns(prices: pd.DataFrame, horizons: List[int]) -> pd.DataFrame:
+    """Add fwd_<h> columns: return from each bar's close to the close h bars later"""
+    grouped_close = prices.groupby("symbol", sort=False)["close"]
+    result = prices.copy()
+    for horizon in horizons:
+        result[f"fwd_{horizon}"] = grouped_close.shift(-horizon).to_numpy() / prices["close"].to_numpy() - 1.0
+    return result
+
+
+def join_signals(signals: pd.DataFrame, prices: pd.DataFrame, horizons: List[int]) -> pd.DataFrame:
+    """Attach the first bar at or after each signal and its forward returns"""
+    bars = forward_returns(prices, horizons).rename(columns={"time": "bar_time"})
+    joined = pd.merge_asof(
+        signals.sort_values("time"),
+        bars.sort_values("bar_time"),
+        left_on="time",
+        right_on="bar_time",
+        by="symbol",
+        direction="forward",
+    )
+    return joined.dropna(subset=["bar_time"])
+
+
+def evaluate(joined: pd.DataFrame, horizons: List[int], hold_band: float = 0.01) -> Dict[str, pd.DataFrame]:
+    """Hit rates and returns per signal type and per confidence bucket
+
+    A buy/sell is a hit when the forward return has the signal's sign; a hold
+    is a hit when the absolute return stays within hold_band.
+    """
+    direction = joined["signal"].map(SIGNAL_DIRECTION).fillna(0.0).to_numpy()
+    is_hold = direction == 0.0
+    frame = pd.DataFrame({
+        "signal": joined["signal"].to_numpy(),
+        "bucket": pd.cut(joined["confidence"], CONFIDENCE_BINS, include_lowest=True).astype(str).to_numpy(),
+    })
+    for horizon in horizons:
+        returns = joined[f"fwd_{horizon}"].to_numpy()
+        valid = ~np.isnan(returns)
+        hit = np.where(is_hold, np.abs(returns) <= hold_band, np.sign(returns) == direction)
+        frame[f"return_{horizon}"] = returns
+        frame[f"strategy_{horizon}"] = np.where(is_hold, 0.0, returns * direction)
+        frame[f"hit_{horizon}"] = np.where(valid, hit.astype(float), np.nan)
+
+    metrics = {}
+    for horizon in horizons:
+        metrics[f"hit_rate_{horizon}"] = (f"hit_{horizon}", "mean")
+        metrics[f"mean_return_{horizon}"] = (f"return_{horizon}", "mean")
+        metrics[f"mean_strategy_{horizon}"] = (f"strategy_{horizon}", "mean")
+
+    by_signal = frame.groupby("signal").agg(count=("signal", "size"), **metrics)
+    by_confidence = frame.groupby("bucket").agg(count=("signal", "size"), **metrics)
+    overall = frame.assign(all="all").groupby("all").agg(count=("signal", "size"), **metrics)
+    return {"overall": overall, "by_signal": by_signal, "by_confidence": by_confidence}
+
+
+def run_backtest(signals_path: str, prices_path: str, horizons: List[int] = DEFAULT_HORIZONS,
+                 symbol_map: Optional[Dict[str, str]] = None, hold_band: float = 0.01) -> Dict[str, pd.DataFrame]:
+    signals = load_signals(signals_path, symbol_map)
+    prices = load_prices(prices_path)
+    joined = join_signals(signals, prices, horizons)
+    results = evaluate(joined, horizons, hold_band)
+    results["coverage"] = pd.DataFrame({
+        "signals": [len(signals)],
+        "matched": [len(joined)],
+        "symbols": [joined["symbol"].nunique()],
+    })
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Backtest stored trade signals against local price history")
+    parser.add_argument("signals", help="Signals file: JSONL (bulk_analyze output), JSON or Parquet")
+    parser.add_argument("prices", help="Directory of <SYMBOL>.csv/.parquet OHLC files or one combined file")
+    parser.add_argument("--horizons", default=",".join(map(str, DEFAULT_HORIZONS)),
+                        help="Forward return horizons in bars, comma separated")
+    parser.add_argument("--symbol-map", help="JSON file mapping signal stock names to price symbols")
+    parser.add_argument("--hold-band", type=float, default=0.01,
+                        help="Max absolute return for a hold signal to count as a hit")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    horizons = [int(h) for h in args.horizons.split(",") if h.strip()]
+    symbol_map = None
+    if args.symbol_map:
+        with open(args.symbol_map) as f:
+            symbol_map = json.load(f)
+
+    results = run_backtest(args.signals, args.prices, horizons, symbol_map, args.hold_band)
+
+    if args.json:
+        print(json.dumps({name: json.loads(table.to_json(orient="index")) for name, table in results.items()},
+                         indent=2))
+    else:
+        with pd.option_context("display.width", 200, "display.max_columns", None, "display.precision", 4):
+            for name, table in results.items():
+                print(f"\n== {name} ==")
+                print(table)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
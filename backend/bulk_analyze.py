@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Offline bulk analysis of headline archives
+Streams headlines from JSONL/CSV/text files or stdin through the same
+analysis engine as /signals and writes results as JSONL. Progress is
+checkpointed so an interrupted backfill resumes where it stopped.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Iterator, Tuple, List, Dict, Any, Optional, Set, TextIO
+
+logger = logging.getLogger("bulk_analyze")
+
+Record = Tuple[int, str]
+
+
+def detect_format(path: str) -> str:
+    if path.endswith(".csv"):
+        return "csv"
+    if path.endswith(".jsonl") or path.endswith(".json"):
+        return "jsonl"
+    return "text"
+
+
+def read_headlines(stream: TextIO, fmt: str, column: str) -> Iterator[Record]:
+    """Yield (index, headline) pairs without loading the whole input"""
+    if fmt == "csv":
+        rows = (row.get(column, "") for row in csv.DictReader(stream))
+    elif fmt == "jsonl":
+        rows = (_headline_from_json(line, column) for line in stream if line.strip())
+    else:
+        rows = (line for line in stream)
+    for index, headline in enumerate(rows):
+        yield index, (headline or "").strip()
+
+
+def _headline_from_json(line: str, column: str) -> str:
+    try:
+        value = json.loads(line)
+    except json.JSONDecodeError:
+        return ""
+    if isinstance(value, dict):
+        return str(value.get(column, ""))
+    return str(value)
+
+
+class Checkpoint:
+    """Tracks the contiguous prefix of input records that are fully written"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.watermark = 0
+        self.done: Set[int] = set()
+        # Keyword-only mode marks skipped records from its reader thread
+        self._lock = threading.Lock()
+
+    def load(self, output_path: str):
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.watermark = json.load(f).get("watermark", 0)
+        if not os.path.exists(output_path):
+            return
+        # Drop a partially written last line left by a crash, then pick up
+        # results that were written beyond the watermark
+        _truncate_partial_line(output_path)
+        with open(output_path) as f:
+            for line in f:
+                try:
+                    index = json.loads(line).get("index")
+                except (json.JSONDecodeError, AttributeError):
+                    continue
+                if isinstance(index, int) and index >= self.watermark:
+                    self.done.add(index)
+
+    def is_done(self, index: int) -> bool:
+        return index < self.watermark or index in self.done
+
+    def mark(self, index: int):
+        with self._lock:
+            self.done.add(index)
+            while self.watermark in self.done:
+                self.done.discard(self.watermark)
+                self.watermark += 1
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, "w") as f:
+                json.dump({"watermark": self.watermark, "updated": time.time()}, f)
+            os.replace(tmp_path, self.path)
+
+
+def _truncate_partial_line(path: str):
+    with open(path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        # Walk back to the previous newline
+        position = size - 1
+        while position > 0:
+            step = min(65536, position)
+            position -= step
+            f.seek(position)
+            chunk = f.read(step)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                f.truncate(position + newline + 1)
+                return
+        f.truncate(0)
+
+
+class Progress:
+    def __init__(self, report_every: int):
+        self.report_every = report_every
+        self.started = time.perf_counter()
+        self.processed = 0
+        self.skipped = 0
+        self.failed = 0
+
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def tick(self, failed: bool = False):
+        self.processed += 1
+        if failed:
+            self.failed += 1
+        if self.processed % self.report_every == 0:
+            logger.info(f"Processed {self.processed} headlines ({self.rate():.1f}/s, {self.failed} failed)")
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        return (f"Processed {self.processed} headlines in {elapsed:.1f}s ({self.rate():.1f}/s), "
+                f"{self.failed} failed, {self.skipped} skipped from checkpoint")
+
+
+def _result_record(index: int, headline: str, analysis: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if analysis is None:
+        return {"index": index, "headline": headline, "error": "analysis failed"}
+    record = dict(analysis)
+    record["index"] = index
+    return record
+
+
+# Keyword-only mode: CPU-bound, so it runs in a process pool
+_worker_analyzer = None
+
+# Headlines per pool task, and the longest a partly filled task waits for
+# more input, so a slow stream still gets results out
+KEYWORD_CHUNK_SIZE = 500
+KEYWORD_CHUNK_SECONDS = 1.0
+
+
+def _analyze_chunk(chunk: List[Record]) -> List[Dict[str, Any]]:
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        from model_router import ModelRouter
+        _worker_analyzer = ModelRouter(None, tiers=["keyword"])
+    return [_result_record(index, headline, _worker_analyzer.analyze_with_keywords(headline))
+            for index, headline in chunk]
+
+
+_END = object()
+
+
+def _read_ahead(records: Iterator[Record], buffer: "queue.Queue"):
+    try:
+        for record in records:
+            buffer.put(record)
+    except BaseException as e:
+        buffer.put(e)
+    buffer.put(_END)
+
+
+def _chunks(records: Iterator[Record], size: int, max_wait: float) -> Iterator[List[Record]]:
+    """Chunks of up to size records, each yielded at most max_wait after its first record
+
+    Records are read in a background thread, so the timer runs even while
+    the input stalls. An empty chunk is yielded whenever max_wait passes
+    with nothing to send, letting the caller write finished work meanwhile.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=size * 2)
+    threading.Thread(target=_read_ahead, args=(records, buffer), daemon=True).start()
+    chunk: List[Record] = []
+    deadline = time.monotonic() + max_wait
+    while True:
+        try:
+            record = buffer.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            yield chunk
+            chunk = []
+            deadline = time.monotonic() + max_wait
+            continue
+        if record is _END:
+            break
+        if isinstance(record, BaseException):
+            raise record
+        if not chunk:
+            deadline = time.monotonic() + max_wait
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+            deadline = time.monotonic() + max_wait
+    if chunk:
+        yield chunk
+
+
+def run_keyword_only(records: Iterator[Record], output: TextIO, checkpoint: Checkpoint, progress: Progress,
+                     workers: int):
+    """Analyze chunks in a process pool, writing each as it finishes
+
+    At most two chunks per worker are in flight, so an unbounded input
+    (e.g. a stream on stdin) is consumed as it arrives rather than read
+    up front.
+    """
+    def write(done):
+        for future in done:
+            for record in future.result():
+                output.write(json.dumps(record) + "\n")
+                checkpoint.mark(record["index"])
+                progress.tick()
+        output.flush()
+        checkpoint.save()
+
+    # Workers are started while the input reader thread runs; forking then
+    # could copy a lock it holds, so they are spawned fresh instead
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        in_flight = set()
+        for chunk in _chunks(records, KEYWORD_CHUNK_SIZE, KEYWORD_CHUNK_SECONDS):
+            if chunk:
+                in_flight.add(executor.submit(_analyze_chunk, chunk))
+            if len(in_flight) >= workers * 2:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            else:
+                done = {future for future in in_flight if future.done()}
+                in_flight -= done
+            if done:
+                write(done)
+        if in_flight:
+            write(wait(in_flight)[0])
+
+
+async def run_pipeline(records: Iterator[Record], output: TextIO, checkpoint: Checkpoint, progress: Progress,
+                       concurrency: int, checkpoint_every: int, min_confidence: int):
+    from news_processor import NewsProcessor
+
+    # Bulk runs have their own checkpoint file; keep the server's analysis queue out of it
+    processor = NewsProcessor(queue_path=None)
+    await processor.warm_up()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            index, headline = item
+            analysis = await processor.analyze_headline(headline)
+            if analysis is not None and analysis.get("confidence", 0) < min_confidence:
+                analysis = None
+            output.write(json.dumps(_result_record(index, headline, analysis)) + "\n")
+            checkpoint.mark(index)
+            progress.tick(failed=analysis is None)
+            if progress.processed % checkpoint_every == 0:
+                output.flush()
+                checkpoint.save()
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        for record in records:
+            await queue.put(record)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        await processor.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk headline analysis with resumable checkpoints")
+    parser.add_argument("input", help="Headline file (.jsonl, .csv or plain text), or - for stdin")
+    parser.add_argument("-o", "--output", required=True, help="Results JSONL file (appended to on resume)")
+    parser.add_argument("--format", choices=["jsonl", "csv", "text"], help="Input format (default: by extension)")
+    parser.add_argument("--column", default="headline", help="Headline field for JSONL/CSV input")
+    parser.add_argument("--concurrency", type=int, default=8, help="Headlines analyzed at once")
+    parser.add_argument("--keyword-only", action="store_true",
+                        help="Use the keyword analyzer in a process pool instead of Ollama")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes for --keyword-only mode")
+    parser.add_argument("--min-confidence", type=int, default=0,
+                        help="Write Ollama results below this confidence as failures")
+    parser.add_argument("--checkpoint-every", type=int, default=100, help="Results between checkpoints")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint and output")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    checkpoint = Checkpoint(f"{args.output}.checkpoint")
+    if args.restart:
+        for path in (args.output, checkpoint.path):
+            if os.path.exists(path):
+                os.remove(path)
+    else:
+        checkpoint.load(args.output)
+        if checkpoint.watermark or checkpoint.done:
+            logger.info(f"Resuming after {checkpoint.watermark} headlines")
+
+    if args.input == "-":
+        stream = sys.stdin
+        fmt = args.format or "text"
+    else:
+        stream = open(args.input, newline="", encoding="utf-8")
+        fmt = args.format or detect_format(args.input)
+
+    progress = Progress(report_every=max(args.checkpoint_every, 100))
+
+    def pending() -> Iterator[Record]:
+        for index, headline in read_headlines(stream, fmt, args.column):
+            if checkpoint.is_done(index):
+                progress.skipped += 1
+            elif not headline:
+                # Nothing to analyze; still advance the watermark
+                checkpoint.mark(index)
+            else:
+                yield index, headline
+
+    try:
+        with open(args.output, "a", encoding="utf-8") as output:
+            if args.keyword_only:
+                run_keyword_only(pending(), output, checkpoint, progress, args.workers)
+            else:
+                asyncio.run(run_pipeline(pending(), output, checkpoint, progress, args.concurrency,
+                                         args.checkpoint_every, args.min_confidence))
+            output.flush()
+    except KeyboardInterrupt:
+        logger.info("Interrupted, saving checkpoint")
+        return 130
+    finally:
+        checkpoint.save()
+        if stream is not sys.stdin:
+            stream.close()
+        logger.info(progress.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
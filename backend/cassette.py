@@ -0,0 +1,411 @@
+"""
+Record and replay of source and Ollama traffic
+Record mode saves every source page or feed body and every Ollama response
+the pipeline receives to a cassette: one file of zlib-compressed bodies,
+identical bodies stored once, plus a JSON index from request key to offsets
+and original latencies. Replay mode memory-maps that file and answers the
+same requests from it without touching the network, as fast as possible or
+with the recorded latencies, so a pipeline run is reproducible and cheap
+enough to benchmark.
+
+    python cassette.py record --mode simulator --path ../data/cassettes/sim
+    python cassette.py replay --mode simulator --path ../data/cassettes/sim --runs 5
+"""
+
+import os
+import sys
+import mmap
+import json
+import time
+import zlib
+import random
+import asyncio
+import hashlib
+import logging
+import argparse
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlparse
+
+from fetch_scheduler import FetchScheduler
+from ollama_client import OllamaClient, OllamaUnavailable
+
+logger = logging.getLogger(__name__)
+
+RECORD, REPLAY = "record", "replay"
+
+# Unset or empty leaves the pipeline on the network
+CASSETTE_MODE = os.getenv("CASSETTE_MODE", "").lower()
+
+DEFAULT_CASSETTE_DIR = os.getenv(
+    "CASSETTE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "cassettes", "default"),
+)
+
+# Replay waits this fraction of each recorded latency (1 = original timing, 0 = none)
+CASSETTE_TIMING = float(os.getenv("CASSETTE_TIMING", "0"))
+
+INDEX_FILE = "index.json"
+DATA_FILE = "bodies.bin"
+INDEX_VERSION = 1
+
+# Ollama payload fields that don't change the response
+IGNORED_PAYLOAD_FIELDS = {"keep_alive"}
+
+
+def fetch_key(url: str) -> str:
+    return f"GET {url}"
+
+
+def ollama_key(url: str, payload: Dict[str, Any]) -> str:
+    """Endpoint path plus a digest of the payload, so any host of a pool matches"""
+    canonical = json.dumps({k: v for k, v in payload.items() if k not in IGNORED_PAYLOAD_FIELDS},
+                           sort_keys=True, separators=(",", ":"))
+    return f"POST {urlparse(url).path} {hashlib.sha1(canonical.encode()).hexdigest()}"
+
+
+class Cassette:
+    """Response bodies on disk, looked up by request key
+
+    A key seen several times while recording replays its responses in the
+    same order, then keeps returning the last one.
+    """
+
+    def __init__(self, path: str = DEFAULT_CASSETTE_DIR, mode: str = REPLAY, timing: float = CASSETTE_TIMING):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = os.path.abspath(path)
+        self.mode = mode
+        self.timing = timing
+        # key -> [[offset, length, elapsed seconds], ...]
+        self.index: Dict[str, List[List[float]]] = {}
+        self.cursors: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self._file = None
+        self._data: Optional[mmap.mmap] = None
+
+        index_path = os.path.join(self.path, INDEX_FILE)
+        data_path = os.path.join(self.path, DATA_FILE)
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                self.index = json.load(f)["entries"]
+        if mode == RECORD:
+            # Recording into an existing cassette adds to it
+            os.makedirs(self.path, exist_ok=True)
+            self._file = open(data_path, "ab")
+            self._offsets: Dict[bytes, Tuple[int, int]] = {}
+        elif not os.path.exists(index_path):
+            raise FileNotFoundError(f"No cassette at {self.path}")
+        elif os.path.getsize(data_path) > 0:
+            with open(data_path, "rb") as f:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def record(self, key: str, body: bytes, elapsed: float):
+        digest = hashlib.sha1(body).digest()
+        location = self._offsets.get(digest)
+        if location is None:
+            compressed = zlib.compress(body)
+            location = (self._file.tell(), len(compressed))
+            self._file.write(compressed)
+            self._offsets[digest] = location
+        self.index.setdefault(key, []).append([location[0], location[1], round(elapsed, 4)])
+        self.recorded += 1
+
+    def play(self, key: str) -> Optional[Tuple[bytes, float]]:
+        """Next recorded body for key and how long it originally took, or None"""
+        entries = self.index.get(key)
+        if not entries or self._data is None:
+            self.misses += 1
+            logger.warning(f"No recording for {key}")
+            return None
+        position = self.cursors.get(key, 0)
+        self.cursors[key] = position + 1
+        offset, length, elapsed = entries[min(position, len(entries) - 1)]
+        self.hits += 1
+        return zlib.decompress(self._data[offset:offset + length]), elapsed
+
+    async def emulate(self, elapsed: float):
+        if self.timing > 0:
+            await asyncio.sleep(elapsed * self.timing)
+
+    def save(self):
+        """Write the index; bodies are flushed first so it never points past them"""
+        if self.mode != RECORD or self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        index_path = os.path.join(self.path, INDEX_FILE)
+        tmp_path = f"{index_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": INDEX_VERSION, "entries": self.index}, f)
+        os.replace(tmp_path, index_path)
+
+    def close(self):
+        self.save()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+
+    def stats(self) -> Dict[str, Any]:
+        data_path = os.path.join(self.path, DATA_FILE)
+        if self._file is not None:
+            size = self._file.tell()
+        else:
+            size = os.path.getsize(data_path) if os.path.exists(data_path) else 0
+        return {
+            "path": self.path,
+            "mode": self.mode,
+            "timing": self.timing,
+            "keys": len(self.index),
+            "responses": sum(len(entries) for entries in self.index.values()),
+            "bytes": size,
+            "recorded": self.recorded,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class RecordedBody:
+    """Stands in for a response's content stream, yielding recorded chunks"""
+
+    def __init__(self, chunks: List[bytes]):
+        self.chunks = chunks
+
+    async def iter_chunked(self, size: int):
+        for chunk in self.chunks:
+            yield chunk
+
+
+class RecordedResponse:
+    """The parts of an aiohttp response that `read` callables use"""
+
+    status = 200
+
+    def __init__(self, chunks: List[bytes]):
+        self.content = RecordedBody(chunks)
+
+
+class TeeBody:
+    """Passes a response's chunks through while keeping the ones actually read"""
+
+    def __init__(self, content):
+        self._content = content
+        self.chunks: List[bytes] = []
+
+    async def iter_chunked(self, size: int):
+        async for chunk in self._content.iter_chunked(size):
+            self.chunks.append(chunk)
+            yield chunk
+
+
+class TeeResponse:
+    def __init__(self, response):
+        self._response = response
+        self.content = TeeBody(response.content)
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+
+def _encode_chunks(chunks: List[bytes]) -> bytes:
+    """Length-prefixed chunks, so a replayed stream splits where the original did"""
+    return b"".join(len(chunk).to_bytes(4, "big") + chunk for chunk in chunks)
+
+
+def _decode_chunks(body: bytes) -> List[bytes]:
+    chunks = []
+    position = 0
+    while position < len(body):
+        length = int.from_bytes(body[position:position + 4], "big")
+        chunks.append(body[position + 4:position + 4 + length])
+        position += 4 + length
+    return chunks
+
+
+class RecordingFetcher(FetchScheduler):
+    """FetchScheduler that saves each successful body to a cassette
+
+    Streamed reads keep only the chunks the reader consumed, so a feed read
+    that stops early is stored and replayed just as far.
+    """
+
+    def __init__(self, cassette: Cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None, read=None) -> Any:
+        started = time.perf_counter()
+        tees: List[TeeResponse] = []
+
+        async def tee_read(response):
+            tee = TeeResponse(response)
+            tees.append(tee)
+            return await read(tee)
+
+        result = await super().fetch(url, headers, tee_read if read is not None else None)
+        if result is not None:
+            body = _encode_chunks(tees[-1].content.chunks) if read is not None else result.encode()
+            self.cassette.record(fetch_key(url), body, time.perf_counter() - started)
+        return result
+
+    async def close(self):
+        await super().close()
+        self.cassette.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "cassette": self.cassette.stats()}
+
+
+class ReplayFetcher:
+    """Answers fetches from a cassette; unrecorded URLs fail like an unreachable site"""
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None, read=None) -> Any:
+        played = self.cassette.play(fetch_key(url))
+        if played is None:
+            return None
+        body, elapsed = played
+        await self.cassette.emulate(elapsed)
+        if read is not None:
+            return await read(RecordedResponse(_decode_chunks(body)))
+        return body.decode()
+
+    async def close(self):
+        self.cassette.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"domains": [], "cassette": self.cassette.stats()}
+
+
+class RecordingOllamaClient(OllamaClient):
+    """OllamaClient that saves each response to a cassette"""
+
+    def __init__(self, cassette: Cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    async def _post(self, url_of, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        started = time.perf_counter()
+        result = await super()._post(url_of, payload)
+        key = ollama_key(url_of(self.endpoints[0]), payload)
+        self.cassette.record(key, json.dumps(result).encode(), time.perf_counter() - started)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "cassette": self.cassette.stats()}
+
+
+class ReplayOllamaClient(OllamaClient):
+    """OllamaClient answered from a cassette; endpoints are always up and models warm
+
+    A request that was never recorded fails like an Ollama outage, so the
+    pipeline falls back to keyword analysis as it would live.
+    """
+
+    def __init__(self, cassette: Cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    async def _post(self, url_of, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        played = self.cassette.play(ollama_key(url_of(self.endpoints[0]), payload))
+        if played is None:
+            raise OllamaUnavailable("No recorded Ollama response for this request")
+        body, elapsed = played
+        await self.cassette.emulate(elapsed)
+        return json.loads(body)
+
+    async def warm_up(self, model: str) -> bool:
+        self.warmed_models.add(model)
+        return True
+
+    async def probe(self, endpoint) -> bool:
+        endpoint.healthy = True
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "cassette": self.cassette.stats()}
+
+
+def cassette_clients(cassette: Cassette) -> Tuple[Any, OllamaClient]:
+    """Fetcher and Ollama client sharing one cassette"""
+    if cassette.mode == RECORD:
+        return RecordingFetcher(cassette), RecordingOllamaClient(cassette)
+    return ReplayFetcher(cassette), ReplayOllamaClient(cassette)
+
+
+def cassette_from_env() -> Optional[Cassette]:
+    """The cassette named by CASSETTE_MODE and CASSETTE_PATH, if any"""
+    if not CASSETTE_MODE:
+        return None
+    cassette = Cassette(DEFAULT_CASSETTE_DIR, CASSETTE_MODE)
+    logger.info(f"{CASSETTE_MODE.capitalize()}ing source and Ollama traffic with cassette {cassette.path}")
+    return cassette
+
+
+def _fingerprint(signals: List[Dict[str, Any]]) -> str:
+    """Digest of a run's signals without timestamps, to compare runs"""
+    fields = ["headline", "stock", "signal", "confidence", "sentiment", "source"]
+    rows = sorted(json.dumps([s.get(f) for f in fields], default=str) for s in signals)
+    return hashlib.sha1("\n".join(rows).encode()).hexdigest()[:12]
+
+
+async def _run(args, mode: str) -> Dict[str, Any]:
+    from news_processor import NewsProcessor
+
+    # Simulator headlines are a random sample; the same seed picks the same ones
+    random.seed(args.seed)
+    cassette = Cassette(args.path, mode, args.timing)
+    # In-memory queue, so no run reuses another run's analyses
+    processor = NewsProcessor(simulated_news=args.mode == "simulator", queue_path=None, cassette=cassette)
+    started = time.perf_counter()
+    signals = []
+    for _ in range(args.cycles):
+        signals = await processor.process_headlines()
+    elapsed = time.perf_counter() - started
+    stats = cassette.stats()
+    await processor.close()
+    return {"seconds": elapsed, "signals": len(signals), "fingerprint": _fingerprint(signals), **stats}
+
+
+def _print_run(label: str, run: Dict[str, Any]):
+    print(f"{label}: {run['seconds'] * 1000:9.1f}ms  {run['signals']} signals  "
+          f"fingerprint {run['fingerprint']}  hits {run['hits']}  misses {run['misses']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record a pipeline run, or replay and time a recorded one")
+    parser.add_argument("action", choices=[RECORD, REPLAY])
+    parser.add_argument("--path", default=DEFAULT_CASSETTE_DIR, help="Cassette directory")
+    parser.add_argument("--mode", choices=["production", "simulator"], default="production",
+                        help="Live news sites, or sample headlines through the Ollama API")
+    parser.add_argument("--cycles", type=int, default=1, help="Processing cycles per run")
+    parser.add_argument("--runs", type=int, default=3, help="Replay runs to time")
+    parser.add_argument("--timing", type=float, default=CASSETTE_TIMING,
+                        help="Fraction of recorded latencies to wait on replay (1 = original timing)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the simulator's headline sample")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.action == RECORD:
+        run = asyncio.run(_run(args, RECORD))
+        _print_run("recorded", run)
+        print(f"{run['responses']} responses under {run['keys']} keys, {run['bytes']} bytes in {run['path']}")
+        return 0
+
+    runs = [asyncio.run(_run(args, REPLAY)) for _ in range(args.runs)]
+    for number, run in enumerate(runs, 1):
+        _print_run(f"replay {number}", run)
+    if len({run["fingerprint"] for run in runs}) > 1:
+        print("Replays produced different signals")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
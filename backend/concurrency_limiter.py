@@ -0,0 +1,100 @@
+"""
+Adaptive concurrency limiter
+AIMD limit on in-flight Ollama requests: grows while latency stays near the
+observed baseline and backs off multiplicatively when latency climbs or
+requests time out.
+"""
+
+import os
+import asyncio
+from typing import Dict, Any, Optional
+
+DEFAULT_INITIAL_LIMIT = int(os.getenv("OLLAMA_CONCURRENCY_INITIAL", "4"))
+DEFAULT_MIN_LIMIT = int(os.getenv("OLLAMA_CONCURRENCY_MIN", "1"))
+DEFAULT_MAX_LIMIT = int(os.getenv("OLLAMA_CONCURRENCY_MAX", "64"))
+
+# Share of the gap to each slower sample the baseline moves up by. After a
+# lasting 3x latency shift the baseline catches up within ~30 samples
+BASELINE_DRIFT = 0.01
+
+
+class AdaptiveLimiter:
+    """Concurrency limit tuned from observed request latency"""
+
+    def __init__(self, initial_limit: int = DEFAULT_INITIAL_LIMIT, min_limit: int = DEFAULT_MIN_LIMIT,
+                 max_limit: int = DEFAULT_MAX_LIMIT, tolerance: float = 2.0, backoff: float = 0.7):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(max(min_limit, min(initial_limit, max_limit)))
+        # Latency up to tolerance x baseline counts as "flat"
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.baseline: Optional[float] = None
+        self.smoothed: Optional[float] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.drops = 0
+        self._last_decrease = 0
+        self._condition = asyncio.Condition()
+
+    @property
+    def current_limit(self) -> int:
+        return int(self.limit)
+
+    async def acquire(self):
+        """Wait for a free slot under the current limit"""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.current_limit)
+            self.in_flight += 1
+
+    async def release(self, latency: Optional[float], dropped: bool = False):
+        """Return a slot and adjust the limit from the request outcome
+
+        dropped marks a timeout rather than a normal reply; a latency of None
+        releases the slot without treating the request as a sample (e.g. a
+        refused connection says nothing about load).
+        """
+        async with self._condition:
+            saturated = self.in_flight >= self.current_limit
+            self.in_flight -= 1
+            if dropped:
+                self.completed += 1
+                self.drops += 1
+                self._decrease()
+            elif latency is not None:
+                self.completed += 1
+                self._on_sample(latency, saturated)
+            self._condition.notify_all()
+
+    def _on_sample(self, latency: float, saturated: bool):
+        if self.baseline is None or latency < self.baseline:
+            self.baseline = latency
+        else:
+            # Let the baseline drift up slowly so a permanently slower host
+            # doesn't pin the limiter at its minimum
+            self.baseline += (latency - self.baseline) * BASELINE_DRIFT
+        self.smoothed = latency if self.smoothed is None else self.smoothed * 0.8 + latency * 0.2
+
+        if self.smoothed > self.baseline * self.tolerance:
+            self._decrease()
+        elif saturated:
+            # Only grow when the limit was actually the bottleneck
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def _decrease(self):
+        # Back off at most once per limit's worth of completions, so one
+        # burst of slow replies doesn't collapse the limit several times over
+        if self.completed - self._last_decrease < self.current_limit:
+            return
+        self._last_decrease = self.completed
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.current_limit,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "drops": self.drops,
+            "baseline_latency_ms": round(self.baseline * 1000, 1) if self.baseline is not None else None,
+            "smoothed_latency_ms": round(self.smoothed * 1000, 1) if self.smoothed is not None else None,
+        }
@@ -1,25 +1,18 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-import json
+"""
+Demo pipeline
+Produces realistic-looking signals from a fixed set of sample headlines, or
+from the synthetic headline generator, without scraping or Ollama, for
+trying out the API and UI.
+"""
+
 import random
-from typing import List, Dict, Any
-from datetime import datetime
 import logging
+from typing import List, Dict, Any, Optional
+from datetime import datetime
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-app = FastAPI(title="Stock News Analyzer Demo", version="1.0.0")
+from headline_generator import HeadlineGenerator, HEADLINES_PER_CYCLE
 
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+logger = logging.getLogger(__name__)
 
 # Sample headlines with realistic stock news
 SAMPLE_HEADLINES = [
@@ -41,7 +34,7 @@ SAMPLE_HEADLINES = [
 ]
 
 # Sample analysis results
-def generate_sample_signal(headline: str) -> Dict[str, Any]:
+def generate_sample_signal(headline: str, stock: Optional[str] = None) -> Dict[str, Any]:
     """Generate realistic sample analysis for a headline"""
     
     # Extract company name from headline
@@ -49,7 +42,8 @@ def generate_sample_signal(headline: str) -> Dict[str, Any]:
                 "Bajaj Finance", "Wipro", "Maruti Suzuki", "SBI", "Bharti Airtel", 
                 "Coal India", "Tata Motors", "ONGC", "Asian Paints"]
     
-    stock = next((comp for comp in companies if comp.lower() in headline.lower()), "Unknown")
+    if stock is None:
+        stock = next((comp for comp in companies if comp.lower() in headline.lower()), "Unknown")
     
     # Generate realistic sentiment and signals based on headline keywords
     positive_keywords = ["jump", "surges", "gains", "growth", "profits", "wins", "discovers", "milestone"]
@@ -111,46 +105,63 @@ def generate_sample_signal(headline: str) -> Dict[str, Any]:
         "timestamp": datetime.now().isoformat()
     }
 
-@app.get("/")
-async def root():
-    return {"message": "Stock News Analyzer Demo API", "status": "running", "mode": "demo"}
 
-@app.get("/signals")
-async def get_signals():
-    """Generate demo signals from sample headlines"""
-    try:
-        # Generate signals from sample headlines
+async def sample_headlines() -> List[str]:
+    """A random selection of the sample headlines, like one scrape of a news page"""
+    return random.sample(SAMPLE_HEADLINES, k=random.randint(8, 12))
+
+
+class DemoProcessor:
+    """Stands in for NewsProcessor in demo mode"""
+
+    def __init__(self, refresh_interval: float = 300, generator: Optional[HeadlineGenerator] = None,
+                 per_cycle: int = HEADLINES_PER_CYCLE):
+        self.refresh_interval = refresh_interval
+        # Synthetic headlines instead of the fixed samples
+        self.generator = generator
+        self.per_cycle = per_cycle
+        self.generated = 0
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def analyze_headline(self, headline: str, stock: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        self.generated += 1
+        return generate_sample_signal(headline, stock)
+
+    async def process_headlines(self) -> List[Dict[str, Any]]:
+        """Generate demo signals from sample or generated headlines"""
+        if self.generator is not None:
+            headlines = [(h.title, h.company) for h in self.generator.take(self.per_cycle)]
+        else:
+            headlines = [(headline, None) for headline in await sample_headlines()]
         signals = []
-        selected_headlines = random.sample(SAMPLE_HEADLINES, k=random.randint(8, 12))
-        
-        for headline in selected_headlines:
-            signal = generate_sample_signal(headline)
+        for headline, stock in headlines:
+            signal = await self.analyze_headline(headline, stock)
             # Only include signals with confidence >= 50
             if signal["confidence"] >= 50:
                 signals.append(signal)
-        
         logger.info(f"Generated {len(signals)} demo signals")
-        
-        return {
-            "signals": signals,
-            "count": len(signals),
-            "timestamp": datetime.now().isoformat(),
-            "mode": "demo"
-        }
-    except Exception as e:
-        logger.error(f"Error generating demo signals: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/signals/cached")
-async def get_cached_signals():
-    """Return empty cache for demo"""
-    return {
-        "signals": [],
-        "count": 0,
-        "timestamp": datetime.now().isoformat(),
-        "mode": "demo"
-    }
+        return signals
+
+    def claim_unannounced(self, signals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Every demo signal is a fresh analysis"""
+        return signals
+
+    def is_degraded(self) -> bool:
+        return False
+
+    def seconds_until_due(self) -> float:
+        return self.refresh_interval
+
+    async def health(self) -> Dict[str, Any]:
+        return {"ollama": "not used in demo mode"}
 
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    def stats(self) -> Dict[str, Any]:
+        stats = {"demo_signals_generated": self.generated}
+        if self.generator is not None:
+            stats["headline_generator"] = self.generator.stats()
+        return stats
@@ -0,0 +1,244 @@
+"""
+RSS/Atom and JSON Feed ingestion
+Feeds are parsed incrementally as the response streams in, so reading stops
+once enough items have been seen. Items are tracked by GUID to tell new
+headlines from ones already analyzed, and carry their published timestamps.
+"""
+
+import os
+import json
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Any, Optional
+from xml.etree.ElementTree import XMLPullParser, ParseError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FEEDS = (
+    "moneycontrol=https://www.moneycontrol.com/rss/business.xml,"
+    "financialexpress=https://www.financialexpress.com/market/feed/"
+)
+
+# Items read from the top of each feed per poll
+FEED_MAX_ITEMS = int(os.getenv("FEED_MAX_ITEMS", "30"))
+
+# GUIDs remembered per feed for newness tracking
+SEEN_GUIDS_LIMIT = 2000
+
+CHUNK_SIZE = 16384
+
+ITEM_TAGS = {"item", "entry"}
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def parse_published(value: Optional[str]) -> Optional[datetime]:
+    """RFC 822 (RSS) or ISO 8601 (Atom, JSON Feed) date as an aware datetime"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+class FeedItem:
+    """One headline from a feed"""
+
+    __slots__ = ("guid", "title", "link", "published", "is_new", "source")
+
+    def __init__(self, guid: str, title: str, link: Optional[str] = None,
+                 published: Optional[datetime] = None, source: Optional[str] = None):
+        self.guid = guid
+        self.title = title
+        self.link = link
+        self.published = published
+        self.is_new = True
+        # Name of the source the item was read from
+        self.source = source
+
+
+def _item_from_element(element) -> Optional[FeedItem]:
+    fields: Dict[str, str] = {}
+    link = None
+    for child in element:
+        name = _local_name(child.tag)
+        if name == "link":
+            # Atom puts the URL in href, RSS in the text
+            href = child.get("href")
+            if href and child.get("rel", "alternate") == "alternate":
+                link = href
+            elif child.text and link is None:
+                link = child.text.strip()
+        elif child.text and name not in fields:
+            fields[name] = child.text.strip()
+
+    title = " ".join(fields.get("title", "").split())
+    if not title:
+        return None
+    guid = fields.get("guid") or fields.get("id") or link or title
+    published = parse_published(fields.get("pubdate") or fields.get("published")
+                                or fields.get("updated") or fields.get("date"))
+    return FeedItem(guid, title, link, published)
+
+
+def _items_from_json_feed(data: Any) -> List[FeedItem]:
+    items = []
+    for entry in (data.get("items") or []) if isinstance(data, dict) else []:
+        title = " ".join(str(entry.get("title") or "").split())
+        if not title:
+            continue
+        link = entry.get("url")
+        guid = str(entry.get("id") or link or title)
+        published = parse_published(entry.get("date_published") or entry.get("date_modified"))
+        items.append(FeedItem(guid, title, link, published))
+    return items
+
+
+class FeedParser:
+    """Push parser for RSS, Atom or JSON Feed bytes
+
+    The format is picked from the first non-blank byte. XML is parsed as it
+    arrives and each item is released once extracted; JSON Feed has no
+    incremental form in the standard library so it is buffered.
+    """
+
+    def __init__(self):
+        self._xml: Optional[XMLPullParser] = None
+        self._json: Optional[List[bytes]] = None
+        self.bytes_read = 0
+
+    def feed(self, data: bytes) -> List[FeedItem]:
+        """Consume a chunk and return the items it completed"""
+        self.bytes_read += len(data)
+        if self._xml is None and self._json is None:
+            stripped = data.lstrip()
+            if not stripped:
+                return []
+            if stripped[:1] in (b"{", b"["):
+                self._json = []
+            else:
+                self._xml = XMLPullParser(events=("end",))
+        if self._json is not None:
+            self._json.append(data)
+            return []
+        self._xml.feed(data)
+        return self._drain()
+
+    def _drain(self) -> List[FeedItem]:
+        items = []
+        for _, element in self._xml.read_events():
+            if _local_name(element.tag) in ITEM_TAGS:
+                item = _item_from_element(element)
+                if item is not None:
+                    items.append(item)
+                element.clear()
+        return items
+
+    def close(self) -> List[FeedItem]:
+        """Finish parsing; raises ParseError or ValueError on a malformed feed"""
+        if self._json is not None:
+            return _items_from_json_feed(json.loads(b"".join(self._json)))
+        if self._xml is None:
+            return []
+        self._xml.close()
+        return self._drain()
+
+
+class FeedSource:
+    """A polled feed with GUID-based newness tracking"""
+
+    def __init__(self, name: str, url: str, max_items: int = FEED_MAX_ITEMS):
+        self.name = name
+        self.url = url
+        self.max_items = max_items
+        self.seen: "OrderedDict[str, None]" = OrderedDict()
+        self.polls = 0
+        self.failures = 0
+        self.parse_failures = 0
+        self.items = 0
+        self.new_items = 0
+        self.bytes_read = 0
+        self.last_new: Optional[int] = None
+
+    async def _read(self, response) -> List[FeedItem]:
+        parser = FeedParser()
+        items: List[FeedItem] = []
+        try:
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                items.extend(parser.feed(chunk))
+                if len(items) >= self.max_items:
+                    # Feeds list newest first; the rest was seen on earlier polls
+                    break
+            else:
+                items.extend(parser.close())
+        finally:
+            self.bytes_read += parser.bytes_read
+        return items[:self.max_items]
+
+    async def poll(self, fetcher) -> Optional[List[FeedItem]]:
+        """Fetch the feed's latest items, or None if it could not be read"""
+        self.polls += 1
+        try:
+            items = await fetcher.fetch(self.url, read=self._read)
+        except (ParseError, ValueError) as e:
+            logger.error(f"Malformed feed {self.name}: {e}")
+            self.parse_failures += 1
+            items = None
+        if items is None:
+            self.failures += 1
+            return None
+
+        new_count = 0
+        for item in items:
+            item.source = self.name
+            item.is_new = item.guid not in self.seen
+            if item.is_new:
+                new_count += 1
+                self.seen[item.guid] = None
+            else:
+                self.seen.move_to_end(item.guid)
+        while len(self.seen) > SEEN_GUIDS_LIMIT:
+            self.seen.popitem(last=False)
+
+        self.items += len(items)
+        self.new_items += new_count
+        self.last_new = new_count
+        logger.info(f"Read {len(items)} items ({new_count} new) from {self.name} feed")
+        return items
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "url": self.url,
+            "polls": self.polls,
+            "failures": self.failures,
+            "parse_failures": self.parse_failures,
+            "items": self.items,
+            "new_items": self.new_items,
+            "last_new": self.last_new,
+            "bytes_read": self.bytes_read,
+        }
+
+
+def feed_sources_from_env() -> List[FeedSource]:
+    """Feeds from NEWS_FEEDS: comma separated `name=url` pairs or bare URLs"""
+    sources = []
+    for index, entry in enumerate(os.getenv("NEWS_FEEDS", DEFAULT_FEEDS).split(",")):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, _, url = entry.partition("=") if "=" in entry.split("://", 1)[0] else ("", "", entry)
+        sources.append(FeedSource(name.strip() or f"feed{index}", url.strip()))
+    return sources
@@ -0,0 +1,220 @@
+"""
+Per-domain politeness scheduler for news fetching
+Each domain gets a token bucket, a cap on concurrent requests and its own
+backoff state. 429/503 responses honour Retry-After, other failures back off
+exponentially with full jitter, and different domains are fetched in parallel.
+A domain's rate is halved when it throttles or errors and creeps back up to
+the configured rate after a run of successful requests.
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional, Callable, Awaitable
+from urllib.parse import urlparse
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = float(os.getenv("FETCH_RATE_PER_DOMAIN", "0.5"))
+DEFAULT_BURST = int(os.getenv("FETCH_BURST_PER_DOMAIN", "2"))
+DEFAULT_MAX_CONCURRENT = int(os.getenv("FETCH_MAX_CONCURRENT_PER_DOMAIN", "2"))
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Statuses that mean "slow down" rather than "this page is broken"
+THROTTLE_STATUSES = {403, 429, 503}
+
+# Adaptive crawl rate: throttles and 5xx multiply a domain's rate by RATE_DECREASE
+# (down to RATE_FLOOR x its configured rate); every RATE_RECOVERY_SUCCESSES
+# successes in a row multiply it by RATE_INCREASE, up to the configured rate
+RATE_DECREASE = 0.5
+RATE_INCREASE = 1.25
+RATE_FLOOR = 1 / 16
+RATE_RECOVERY_SUCCESSES = 10
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, up to `burst` saved"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class DomainState:
+    """Rate limit, backoff and counters for one domain"""
+
+    def __init__(self, domain: str, rate: float, burst: int, max_concurrent: int):
+        self.domain = domain
+        self.bucket = TokenBucket(rate, burst)
+        # Configured rate; bucket.rate adapts below it
+        self.base_rate = rate
+        self.successes = 0
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.backoff_until = 0.0
+        self.consecutive_failures = 0
+        self.requests = 0
+        self.throttled = 0
+        self.failures = 0
+
+    def slow_down(self):
+        self.successes = 0
+        rate = max(self.base_rate * RATE_FLOOR, self.bucket.rate * RATE_DECREASE)
+        if rate < self.bucket.rate:
+            logger.info(f"Lowering fetch rate for {self.domain} to {rate:.3f}/s")
+        self.bucket.rate = rate
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self.successes += 1
+        if self.successes >= RATE_RECOVERY_SUCCESSES and self.bucket.rate < self.base_rate:
+            self.successes = 0
+            self.bucket.rate = min(self.base_rate, self.bucket.rate * RATE_INCREASE)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "domain": self.domain,
+            "rate": round(self.bucket.rate, 3),
+            "base_rate": self.base_rate,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "failures": self.failures,
+            "backoff_remaining": round(max(0.0, self.backoff_until - time.monotonic()), 1),
+        }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class FetchScheduler:
+    """Polite HTTP GET client shared by all news sources"""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                 max_concurrent: int = DEFAULT_MAX_CONCURRENT, max_retries: int = 2,
+                 base_backoff: float = 2.0, max_backoff: float = 300.0, max_wait: float = 15.0,
+                 domain_rates: Optional[Dict[str, float]] = None, timeout: float = 10):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        # Longest backoff a single fetch will sit out before giving up
+        self.max_wait = max_wait
+        self.domain_rates = domain_rates or {}
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.domains: Dict[str, DomainState] = {}
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    def _domain(self, url: str) -> DomainState:
+        domain = urlparse(url).netloc.lower()
+        if domain not in self.domains:
+            rate = self.domain_rates.get(domain, self.rate)
+            self.domains[domain] = DomainState(domain, rate, self.burst, self.max_concurrent)
+        return self.domains[domain]
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(headers={"User-Agent": USER_AGENT}, timeout=self.timeout)
+        return self.session
+
+    def _back_off(self, state: DomainState, retry_after: Optional[float]) -> float:
+        state.consecutive_failures += 1
+        if retry_after is None:
+            ceiling = min(self.max_backoff, self.base_backoff * 2 ** (state.consecutive_failures - 1))
+            retry_after = random.uniform(ceiling / 2, ceiling)
+        state.backoff_until = max(state.backoff_until, time.monotonic() + retry_after)
+        return retry_after
+
+    async def _sit_out_backoff(self, state: DomainState, url: str) -> bool:
+        """Sleep through a short domain backoff; False if it is too long to wait"""
+        wait = state.backoff_until - time.monotonic()
+        if wait > self.max_wait:
+            logger.info(f"Skipping {url}: {state.domain} is backing off for {wait:.0f}s")
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None,
+                    read: Optional[Callable[[aiohttp.ClientResponse], Awaitable[Any]]] = None) -> Any:
+        """GET a URL as text, or None if it failed or the domain is backing off
+
+        `read` replaces reading the body as text, e.g. to parse it as it streams in.
+        """
+        state = self._domain(url)
+        session = await self._get_session()
+
+        for attempt in range(self.max_retries + 1):
+            async with state.semaphore:
+                if not await self._sit_out_backoff(state, url):
+                    return None
+                await state.bucket.acquire()
+                # A backoff may have started while this request waited for a token
+                if not await self._sit_out_backoff(state, url):
+                    return None
+                state.requests += 1
+                try:
+                    async with session.get(url, headers=headers) as response:
+                        if response.status == 200:
+                            state.record_success()
+                            if read is not None:
+                                return await read(response)
+                            return await response.text()
+                        if response.status in THROTTLE_STATUSES:
+                            state.throttled += 1
+                            state.slow_down()
+                            delay = self._back_off(state, parse_retry_after(response.headers.get("Retry-After")))
+                            logger.warning(f"{state.domain} returned {response.status}, backing off {delay:.1f}s")
+                            continue
+                        state.failures += 1
+                        if response.status >= 500:
+                            state.slow_down()
+                        logger.error(f"{url} returned status: {response.status}")
+                        return None
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    state.failures += 1
+                    state.slow_down()
+                    delay = self._back_off(state, None)
+                    logger.warning(f"Error fetching {url}: {e!r}, backing off {delay:.1f}s")
+
+        return None
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"domains": [state.to_dict() for state in self.domains.values()]}
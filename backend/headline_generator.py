@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Synthetic headline generator
+Produces an unbounded, seeded stream of realistic stock news headlines from
+templates over a configurable universe of companies and event types. Some
+headlines repeat an earlier story word for word (as when several outlets
+syndicate it) or paraphrase it through another template, so caching, dedup,
+aggregation and storage can be exercised at any volume. The same seed always
+gives the same stream.
+
+    python headline_generator.py --count 200000 -o headlines.jsonl
+    python headline_generator.py --rate 500 | python bulk_analyze.py - -o results.jsonl --keyword-only
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from bisect import bisect
+from itertools import accumulate
+from string import Formatter
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator
+
+from feed_reader import FeedItem
+
+# "generated" makes demo and simulator modes use this generator instead of the fixed samples
+DEMO_HEADLINES = os.getenv("DEMO_HEADLINES", "samples").lower()
+GENERATED = "generated"
+
+HEADLINE_SEED = int(os.getenv("HEADLINE_SEED", "0"))
+HEADLINE_COMPANIES = int(os.getenv("HEADLINE_COMPANIES", "50"))
+HEADLINE_DUPLICATE_RATE = float(os.getenv("HEADLINE_DUPLICATE_RATE", "0.05"))
+HEADLINE_PARAPHRASE_RATE = float(os.getenv("HEADLINE_PARAPHRASE_RATE", "0.1"))
+HEADLINES_PER_CYCLE = int(os.getenv("HEADLINES_PER_CYCLE", "12"))
+
+# Earlier stories that duplicates and paraphrases are drawn from
+RECENT_STORIES = 500
+
+NEW, DUPLICATE, PARAPHRASE = "new", "duplicate", "paraphrase"
+
+# Listed companies the universe starts with, then synthetic ones
+COMPANIES = [
+    "Reliance Industries", "TCS", "HDFC Bank", "Infosys", "Adani Enterprises", "ITC",
+    "Bajaj Finance", "Wipro", "Maruti Suzuki", "SBI", "Bharti Airtel", "Coal India",
+    "Tata Motors", "ONGC", "Asian Paints", "ICICI Bank", "Larsen & Toubro", "Kotak Mahindra Bank",
+    "Axis Bank", "Sun Pharma", "HCL Technologies", "UltraTech Cement", "Titan", "Nestle India",
+    "Tata Steel", "JSW Steel", "Power Grid", "NTPC", "Hindustan Unilever", "Mahindra & Mahindra",
+]
+
+NAME_ROOTS = [
+    "Apex", "Sagar", "Vardhman", "Shree", "Kaveri", "Nirmal", "Orient", "Pioneer", "Sterling",
+    "Zenith", "Indus", "Ganga", "Deccan", "Himalaya", "Konark", "Meridian", "Navbharat", "Suryoday",
+    "Aravali", "Bharat", "Crescent", "Everest", "Godavari", "Jyoti", "Kalinga", "Lotus", "Malabar",
+    "Narmada", "Prestige", "Rajshree", "Saraswati", "Trident", "Utkal", "Vindhya", "Yamuna", "Amrit",
+    "Coromandel", "Kohinoor", "Nilgiri", "Satpura",
+]
+
+NAME_SECTORS = [
+    "Cements", "Pharma", "Textiles", "Steel", "Finance", "Infra", "Power", "Chemicals",
+    "Foods", "Motors", "Technologies", "Realty", "Logistics", "Fertilisers", "Paper",
+]
+
+# Event type -> sentiment -> templates. A story fills every slot its group
+# uses, so any template of the group can paraphrase another.
+EVENT_TEMPLATES: Dict[str, Dict[str, List[str]]] = {
+    "Earnings Report": {
+        "positive": [
+            "{company} reports {pct}% jump in {quarter} profits on strong demand",
+            "{company} shares surge after {quarter} profits beat estimates by {pct}%",
+            "{company} posts record {quarter} profits as revenue growth hits {pct}%",
+        ],
+        "negative": [
+            "{company} {quarter} profit drops {pct}% as input costs rise",
+            "{company} shares fall {pct}% after weak {quarter} results",
+            "{company} reports {pct}% decline in {quarter} net income",
+        ],
+        "neutral": [
+            "{company} to announce {quarter} results on {month} {day}",
+            "{company} board to meet on {month} {day} to consider {quarter} results",
+        ],
+    },
+    "Business Contract": {
+        "positive": [
+            "{company} wins Rs {amount} crore contract from {partner}",
+            "{company} shares gain on Rs {amount} crore deal with {partner}",
+            "{company} wins multi-year deal worth Rs {amount} crore from {partner}",
+        ],
+        "negative": [
+            "{company} shares fall after {partner} cancels Rs {amount} crore contract",
+            "{company} stock drops {pct}% as {partner} scraps Rs {amount} crore deal",
+        ],
+    },
+    "Operational Update": {
+        "positive": [
+            "{company} sales jump {pct}% in {month}",
+            "{company} reports {pct}% growth in {month} sales volumes",
+            "{company} monthly sales cross {units} units milestone in {month}",
+        ],
+        "negative": [
+            "{company} sales decline {pct}% in {month}, shares fall",
+            "{company} production drops {pct}% on plant shutdown in {region}",
+            "{company} cuts production in {region} amid component shortage",
+        ],
+    },
+    "Regulatory": {
+        "positive": [
+            "{company} shares surge after regulator clears {region} expansion",
+            "{company} stock gains as tribunal quashes Rs {amount} crore tax demand",
+        ],
+        "negative": [
+            "{company} faces regulatory scrutiny over {issue}",
+            "SEBI probe into {issue} raises concerns for {company}",
+            "{company} shares tumble after Rs {amount} crore penalty over {issue}",
+        ],
+    },
+    "Corporate News": {
+        "positive": [
+            "{company} shares gain after board approves Rs {amount} crore buyback",
+            "{company} announces expansion into {region}, stock surges {pct}%",
+            "{company} stock jumps {pct}% on plans to enter {region} market",
+        ],
+        "negative": [
+            "{company} shares tumble {pct}% as chief executive resigns",
+            "{company} stock falls amid concerns over rising debt levels",
+        ],
+        "neutral": [
+            "{company} appoints new chief financial officer",
+            "{company} to hold annual general meeting on {month} {day}",
+        ],
+    },
+}
+
+SENTIMENT_WEIGHTS = {"positive": 0.45, "negative": 0.35, "neutral": 0.2}
+
+QUARTERS = ["Q1", "Q2", "Q3", "Q4"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July",
+          "August", "September", "October", "November", "December"]
+REGIONS = ["Gujarat", "Maharashtra", "Tamil Nadu", "Southeast Asia", "the Middle East",
+           "Europe", "Africa", "Karnataka", "Odisha", "the US"]
+PARTNERS = ["a European client", "a Fortune 500 company", "Indian Railways", "NHAI",
+            "a Gulf utility", "the defence ministry", "a US retailer", "a Japanese automaker"]
+ISSUES = ["digital lending practices", "related party transactions", "pricing practices",
+          "delayed disclosures", "data privacy lapses", "environmental clearances"]
+
+SLOT_CHOICES = {"quarter": QUARTERS, "month": MONTHS, "region": REGIONS, "partner": PARTNERS, "issue": ISSUES}
+
+# Slot -> (low, high, format) for numbers drawn uniformly between low and high
+SLOT_RANGES = {
+    "pct": (2, 30, "{}"),
+    "day": (1, 28, "{}"),
+    "amount": (100, 20000, "{:,}"),
+    "units": (10000, 500000, "{:,}"),
+}
+
+
+def _template_slots(templates: List[str]) -> List[str]:
+    """Slots used by any of the templates, so a story can be told with each of them"""
+    names = {name for template in templates for _, name, _, _ in Formatter().parse(template) if name}
+    return sorted(names - {"company"})
+
+
+# Event type -> sentiment -> slots to draw for a new story
+GROUP_SLOTS = {event: {sentiment: _template_slots(templates) for sentiment, templates in by_sentiment.items()}
+               for event, by_sentiment in EVENT_TEMPLATES.items()}
+
+
+def build_universe(size: int, rng: random.Random) -> List[str]:
+    """size company names: the listed companies first, then synthetic ones"""
+    if size <= len(COMPANIES):
+        return COMPANIES[:size]
+    synthetic = [f"{root} {sector}" for root in NAME_ROOTS for sector in NAME_SECTORS]
+    limit = len(COMPANIES) + len(synthetic)
+    if size > limit:
+        raise ValueError(f"At most {limit} companies can be generated")
+    rng.shuffle(synthetic)
+    return COMPANIES + synthetic[:size - len(COMPANIES)]
+
+
+class GeneratedHeadline:
+    """A headline plus the story it tells, for checking dedup and analysis against"""
+
+    __slots__ = ("guid", "title", "company", "event", "sentiment", "story", "kind", "published")
+
+    def __init__(self, guid: str, title: str, company: str, event: str, sentiment: str,
+                 story: int, kind: str, published: datetime):
+        self.guid = guid
+        self.title = title
+        self.company = company
+        self.event = event
+        self.sentiment = sentiment
+        # Duplicates and paraphrases share the story number of the original
+        self.story = story
+        self.kind = kind
+        self.published = published
+
+    def to_feed_item(self, source: str) -> FeedItem:
+        return FeedItem(self.guid, self.title, published=self.published, source=source)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "guid": self.guid,
+            "headline": self.title,
+            "company": self.company,
+            "event": self.event,
+            "sentiment": self.sentiment,
+            "story": self.story,
+            "kind": self.kind,
+            "published": self.published.isoformat(),
+        }
+
+
+class HeadlineGenerator:
+    """Seeded, unbounded headline stream
+
+    rate is headlines per second: stream() is paced to it and published
+    times are spaced by it, starting at start.
+    """
+
+    def __init__(self, seed: int = HEADLINE_SEED, companies: int = HEADLINE_COMPANIES,
+                 duplicate_rate: float = HEADLINE_DUPLICATE_RATE,
+                 paraphrase_rate: float = HEADLINE_PARAPHRASE_RATE,
+                 rate: float = 1.0, start: Optional[datetime] = None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.companies = build_universe(companies, self.rng)
+        self.duplicate_rate = duplicate_rate
+        self.paraphrase_rate = paraphrase_rate
+        self.rate = rate
+        self.start = start or datetime.now()
+        self.events = list(EVENT_TEMPLATES)
+        # Event -> (sentiments it has templates for, their cumulative weights)
+        self.sentiment_weights = {
+            event: (list(by_sentiment), list(accumulate(SENTIMENT_WEIGHTS[s] for s in by_sentiment)))
+            for event, by_sentiment in EVENT_TEMPLATES.items()
+        }
+        # (story, company, event, sentiment, template index, slots, title) of recent originals
+        self.recent: deque = deque(maxlen=RECENT_STORIES)
+        self.generated = 0
+        self.stories = 0
+        self.kinds: Counter = Counter()
+
+    def _pick(self, options: List[Any]) -> Any:
+        # Indexing by random() is several times cheaper than rng.choice
+        return options[int(self.rng.random() * len(options))]
+
+    def _slots(self, company: str, names: List[str]) -> Dict[str, Any]:
+        slots = {"company": company}
+        for name in names:
+            choices = SLOT_CHOICES.get(name)
+            if choices is not None:
+                slots[name] = self._pick(choices)
+            else:
+                low, high, fmt = SLOT_RANGES[name]
+                slots[name] = fmt.format(low + int(self.rng.random() * (high - low + 1)))
+        return slots
+
+    def _new_story(self):
+        company = self._pick(self.companies)
+        event = self._pick(self.events)
+        sentiments, cumulative = self.sentiment_weights[event]
+        sentiment = sentiments[bisect(cumulative, self.rng.random() * cumulative[-1])]
+        templates = EVENT_TEMPLATES[event][sentiment]
+        template = int(self.rng.random() * len(templates))
+        slots = self._slots(company, GROUP_SLOTS[event][sentiment])
+        title = templates[template].format(**slots)
+        story = (self.stories, company, event, sentiment, template, slots, title)
+        self.stories += 1
+        self.recent.append(story)
+        return story, title, NEW
+
+    def _retell(self, paraphrase: bool):
+        story = self._pick(self.recent)
+        _, _, event, sentiment, template, slots, title = story
+        templates = EVENT_TEMPLATES[event][sentiment]
+        if not paraphrase or len(templates) < 2:
+            return story, title, DUPLICATE
+        # Any template but the original's
+        other = (template + 1 + int(self.rng.random() * (len(templates) - 1))) % len(templates)
+        return story, templates[other].format(**slots), PARAPHRASE
+
+    def next(self) -> GeneratedHeadline:
+        roll = self.rng.random()
+        if self.recent and roll < self.duplicate_rate:
+            story, title, kind = self._retell(paraphrase=False)
+        elif self.recent and roll < self.duplicate_rate + self.paraphrase_rate:
+            story, title, kind = self._retell(paraphrase=True)
+        else:
+            story, title, kind = self._new_story()
+        number, company, event, sentiment = story[:4]
+        published = self.start + timedelta(seconds=self.generated / self.rate)
+        headline = GeneratedHeadline(f"gen-{self.seed}-{self.generated}", title, company,
+                                     event, sentiment, number, kind, published)
+        self.generated += 1
+        self.kinds[kind] += 1
+        return headline
+
+    def __iter__(self) -> Iterator[GeneratedHeadline]:
+        while True:
+            yield self.next()
+
+    def take(self, count: int) -> List[GeneratedHeadline]:
+        return [self.next() for _ in range(count)]
+
+    async def stream(self, limit: Optional[int] = None) -> AsyncIterator[GeneratedHeadline]:
+        """Yield headlines at self.rate per second, without drifting behind on slow consumers"""
+        started = time.monotonic()
+        count = 0
+        while limit is None or count < limit:
+            delay = started + count / self.rate - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield self.next()
+            count += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "seed": self.seed,
+            "companies": len(self.companies),
+            "generated": self.generated,
+            "stories": self.stories,
+            **{kind: self.kinds.get(kind, 0) for kind in (NEW, DUPLICATE, PARAPHRASE)},
+        }
+
+
+def headline_generator_from_env(refresh_interval: float) -> Optional[HeadlineGenerator]:
+    """The generator for demo and simulator modes, if DEMO_HEADLINES selects it
+
+    Each refresh takes HEADLINES_PER_CYCLE headlines, so published times
+    keep pace with the refresh interval.
+    """
+    if DEMO_HEADLINES != GENERATED:
+        return None
+    return HeadlineGenerator(rate=HEADLINES_PER_CYCLE / refresh_interval)
+
+
+async def _write(args) -> int:
+    generator = HeadlineGenerator(args.seed, args.companies, args.duplicate_rate,
+                                  args.paraphrase_rate, rate=args.rate or 1.0)
+    as_jsonl = args.format == "jsonl" or (args.format is None and args.output.endswith(".jsonl"))
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    started = time.perf_counter()
+    try:
+        # Without --rate, headlines are produced as fast as they can be written
+        headlines = generator.stream(args.count) if args.rate else _unpaced(generator, args.count)
+        async for headline in headlines:
+            out.write(json.dumps(headline.to_dict()) + "\n" if as_jsonl else headline.title + "\n")
+            if args.rate:
+                out.flush()
+    except BrokenPipeError:
+        pass
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - started
+    stats = generator.stats()
+    print(f"{stats['generated']} headlines in {elapsed:.1f}s ({stats['generated'] / max(elapsed, 1e-9):,.0f}/s): "
+          f"{stats['new']} new, {stats['duplicate']} duplicates, {stats['paraphrase']} paraphrases "
+          f"over {stats['companies']} companies", file=sys.stderr)
+    return 0
+
+
+async def _unpaced(generator: HeadlineGenerator, count: Optional[int]) -> AsyncIterator[GeneratedHeadline]:
+    produced = 0
+    while count is None or produced < count:
+        yield generator.next()
+        produced += 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate a seeded stream of synthetic stock headlines")
+    parser.add_argument("--count", type=int, help="Headlines to generate (default: unbounded)")
+    parser.add_argument("-o", "--output", default="-", help="Output file, or - for stdout")
+    parser.add_argument("--format", choices=["jsonl", "text"],
+                        help="jsonl with story metadata, or one headline per line (default: by extension)")
+    parser.add_argument("--rate", type=float, help="Headlines per second (default: as fast as possible)")
+    parser.add_argument("--seed", type=int, default=HEADLINE_SEED)
+    parser.add_argument("--companies", type=int, default=HEADLINE_COMPANIES, help="Size of the company universe")
+    parser.add_argument("--duplicate-rate", type=float, default=HEADLINE_DUPLICATE_RATE,
+                        help="Share of headlines repeating an earlier one exactly")
+    parser.add_argument("--paraphrase-rate", type=float, default=HEADLINE_PARAPHRASE_RATE,
+                        help="Share of headlines retelling an earlier story in other words")
+    args = parser.parse_args()
+    try:
+        return asyncio.run(_write(args))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
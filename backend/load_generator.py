@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Dashboard load generator
+Simulates many demo.html / App.tsx dashboards against one backend, with their
+refresh schedule compressed in time, and reports throughput, latency
+percentiles, errors and the server's memory. It can launch the backend
+itself (demo mode, or simulator mode behind ollama_server.py) or target a
+running one.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple
+
+import aiohttp
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BACKEND_DIR)
+
+# Dashboards refresh the full list every 5 minutes and long-poll changes for 30s
+POLL_INTERVAL = 300
+LONG_POLL_TIMEOUT = 30
+
+ARRIVALS = ["burst", "ramp", "poisson"]
+CLIENTS = ["poll", "sync"]
+DEFAULT_MIX = "/signals=6,/signals/cached=3,/health=1"
+
+REQUEST_TIMEOUT = 60
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """`path=weight` pairs, e.g. /signals=6,/health=1"""
+    mix = {}
+    for entry in value.split(","):
+        path, _, weight = entry.strip().partition("=")
+        if path:
+            mix[path] = float(weight or 1)
+    return mix
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    """Resident memory of a process from /proc (Linux only)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class Results:
+    """Latencies and errors per endpoint"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, Counter] = {}
+        self.rss: List[float] = []
+        # Refreshes skipped because the previous one was still running
+        self.missed_polls = 0
+        self.started = time.monotonic()
+        self.finished: Optional[float] = None
+
+    def record(self, path: str, seconds: float, error: Optional[str] = None):
+        if error is None:
+            self.latencies.setdefault(path, []).append(seconds)
+        else:
+            self.errors.setdefault(path, Counter())[error] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = (self.finished or time.monotonic()) - self.started
+        endpoints = {}
+        for path in sorted(set(self.latencies) | set(self.errors)):
+            ordered = sorted(self.latencies.get(path, []))
+            errors = self.errors.get(path, Counter())
+            total = len(ordered) + sum(errors.values())
+            endpoints[path] = {
+                "requests": total,
+                "per_second": round(total / elapsed, 2),
+                "error_rate": round(sum(errors.values()) / total, 4) if total else 0.0,
+                "errors": dict(errors),
+                **{f"{name}_ms": round(percentile(ordered, q) * 1000, 1)
+                   for name, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99))},
+                "max_ms": round(ordered[-1] * 1000, 1) if ordered else 0.0,
+            }
+        total = sum(e["requests"] for e in endpoints.values())
+        failed = sum(sum(e["errors"].values()) for e in endpoints.values())
+        return {
+            "seconds": round(elapsed, 1),
+            "requests": total,
+            "per_second": round(total / elapsed, 2) if elapsed else 0.0,
+            "error_rate": round(failed / total, 4) if total else 0.0,
+            "missed_polls": self.missed_polls,
+            "server_rss_mb": {
+                "start": round(self.rss[0], 1),
+                "peak": round(max(self.rss), 1),
+                "end": round(self.rss[-1], 1),
+            } if self.rss else None,
+            "endpoints": endpoints,
+        }
+
+
+class Dashboard:
+    """One simulated browser tab with its own connection"""
+
+    def __init__(self, base_url: str, results: Results, speedup: float, mix: Dict[str, float], client: str):
+        self.base_url = base_url
+        self.results = results
+        self.speedup = speedup
+        self.paths = list(mix)
+        self.weights = list(mix.values())
+        self.client = client
+        self.version = 0
+
+    async def request(self, session: aiohttp.ClientSession, path: str,
+                      params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        started = time.monotonic()
+        try:
+            async with session.get(self.base_url + path, params=params) as response:
+                body = await response.read()
+                if response.status >= 400:
+                    self.results.record(path, 0, f"http_{response.status}")
+                    return None
+        except asyncio.TimeoutError:
+            self.results.record(path, 0, "timeout")
+            return None
+        except aiohttp.ClientError as e:
+            self.results.record(path, 0, type(e).__name__)
+            return None
+        self.results.record(path, time.monotonic() - started)
+        try:
+            return json.loads(body)
+        except ValueError:
+            return None
+
+    async def run(self, deadline: float):
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT + LONG_POLL_TIMEOUT)
+        async with aiohttp.ClientSession(timeout=timeout, connector=aiohttp.TCPConnector(limit=1)) as session:
+            # Page load
+            data = await self.request(session, "/signals")
+            self.version = (data or {}).get("version", 0)
+            if self.client == "sync":
+                await self.sync(session, deadline)
+            else:
+                await self.poll(session, deadline)
+
+    async def poll(self, session: aiohttp.ClientSession, deadline: float):
+        """The 5 minute refresh, each tick hitting one endpoint from the mix"""
+        interval = POLL_INTERVAL / self.speedup
+        # Tabs opened at different times refresh at different phases
+        next_poll = time.monotonic() + random.uniform(0, interval)
+        while next_poll < deadline:
+            await asyncio.sleep(next_poll - time.monotonic())
+            await self.request(session, random.choices(self.paths, self.weights)[0])
+            next_poll += interval
+            # A tab still waiting on a slow refresh skips the ones it missed
+            while next_poll < time.monotonic():
+                next_poll += interval
+                self.results.missed_polls += 1
+
+    async def sync(self, session: aiohttp.ClientSession, deadline: float):
+        """Long-polling /signals/changes like the current frontends"""
+        wait = max(0.5, LONG_POLL_TIMEOUT / self.speedup)
+        while time.monotonic() + wait < deadline:
+            data = await self.request(session, "/signals/changes", {"since": self.version, "timeout": wait})
+            if data is None:
+                await asyncio.sleep(min(5.0, wait))
+                continue
+            self.version = data.get("version", self.version)
+
+
+def arrival_delays(count: int, pattern: str, ramp: float) -> List[float]:
+    """Seconds after start at which each dashboard opens"""
+    if pattern == "burst" or ramp <= 0:
+        return [0.0] * count
+    if pattern == "ramp":
+        return [ramp * i / count for i in range(count)]
+    # Poisson arrivals averaging count over the ramp period
+    delays, at = [], 0.0
+    for _ in range(count):
+        at += random.expovariate(count / ramp)
+        delays.append(at)
+    return delays
+
+
+async def sample_rss(pid: int, results: Results, stop: asyncio.Event):
+    while not stop.is_set():
+        rss = rss_mb(pid)
+        if rss is not None:
+            results.rss.append(rss)
+        try:
+            await asyncio.wait_for(stop.wait(), 1.0)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_load(base_url: str, dashboards: int, duration: float, speedup: float, arrival: str, ramp: float,
+                   mix: Dict[str, float], client: str, server_pid: Optional[int]) -> Dict[str, Any]:
+    results = Results()
+    deadline = time.monotonic() + duration
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_rss(server_pid, results, stop)) if server_pid else None
+
+    async def open_dashboard(delay: float):
+        await asyncio.sleep(delay)
+        if time.monotonic() < deadline:
+            await Dashboard(base_url, results, speedup, mix, client).run(deadline)
+
+    await asyncio.gather(*(open_dashboard(delay) for delay in arrival_delays(dashboards, arrival, ramp)))
+    results.finished = time.monotonic()
+    stop.set()
+    if sampler is not None:
+        await sampler
+    return results.summary()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(url: str, process: subprocess.Popen, timeout: float = 60):
+    import urllib.request
+    started = time.monotonic()
+    while time.monotonic() - started < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} server exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(url, timeout=2):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"{url} not up after {timeout}s")
+
+
+def launch_backend(mode: str, data_dir: str) -> Tuple[str, List[subprocess.Popen]]:
+    """Start the backend (and for simulator mode, ollama_server.py) on free ports"""
+    processes = []
+    # Keep test signals, queue and watchlists out of the real data directory
+    env = dict(os.environ,
+               SIGNAL_ARCHIVE_DIR=os.path.join(data_dir, "signals"),
+               VECTOR_INDEX_DIR=os.path.join(data_dir, "vectors"),
+               ANALYSIS_QUEUE_FILE=os.path.join(data_dir, "analysis_queue.db"),
+               WATCHLIST_FILE=os.path.join(data_dir, "watchlists.json"))
+    if mode == "simulator":
+        ollama_port = _free_port()
+        simulator = subprocess.Popen([sys.executable, "-m", "uvicorn", "ollama_server:app", "--port", str(ollama_port),
+                                      "--log-level", "warning"], cwd=ROOT_DIR)
+        processes.append(simulator)
+        wait_until_up(f"http://127.0.0.1:{ollama_port}/api/tags", simulator)
+        env["OLLAMA_URLS"] = f"http://127.0.0.1:{ollama_port}"
+    port = _free_port()
+    backend = subprocess.Popen([sys.executable, "start.py", "--mode", mode, "--host", "127.0.0.1", "--port", str(port)],
+                               cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    processes.append(backend)
+    base_url = f"http://127.0.0.1:{port}"
+    wait_until_up(f"{base_url}/health", backend)
+    return base_url, processes
+
+
+def print_summary(summary: Dict[str, Any]):
+    print(f"{summary['requests']} requests in {summary['seconds']}s: {summary['per_second']} req/s, "
+          f"{summary['error_rate']:.2%} errors, {summary['missed_polls']} refreshes missed while saturated")
+    if summary["server_rss_mb"]:
+        rss = summary["server_rss_mb"]
+        print(f"Server RSS: {rss['start']} MB at start, {rss['peak']} MB peak, {rss['end']} MB at end")
+    print(f"\n{'endpoint':<20}{'requests':>9}{'req/s':>9}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}{'errors':>8}")
+    for path, e in summary["endpoints"].items():
+        print(f"{path:<20}{e['requests']:>9}{e['per_second']:>9}{e['p50_ms']:>9}{e['p90_ms']:>9}{e['p99_ms']:>9}"
+              f"{e['max_ms']:>9}{sum(e['errors'].values()):>8}")
+        for error, count in e["errors"].items():
+            print(f"    {error}: {count}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Simulate many polling dashboards against the backend")
+    parser.add_argument("--dashboards", type=int, default=500, help="Number of simulated dashboards")
+    parser.add_argument("--duration", type=float, default=60, help="Test length in seconds")
+    parser.add_argument("--speedup", type=float, default=30,
+                        help="Time compression; 30 turns the 5 minute refresh into 10 seconds")
+    parser.add_argument("--arrival", choices=ARRIVALS, default="ramp",
+                        help="burst: all at once, ramp: evenly over --ramp, poisson: random over --ramp")
+    parser.add_argument("--ramp", type=float, default=10, help="Seconds over which dashboards open")
+    parser.add_argument("--client", choices=CLIENTS, default="poll",
+                        help="poll: periodic requests per --mix, sync: long-poll /signals/changes")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weighted endpoints for poll clients")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="Target a running backend, e.g. http://localhost:8000")
+    target.add_argument("--launch", choices=["demo", "simulator"], default="demo",
+                        help="Start a backend in this mode for the test (default)")
+    parser.add_argument("--server-pid", type=int, help="PID of a backend given with --url, to sample its RSS")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    processes = []
+    data_dir = tempfile.TemporaryDirectory(prefix="load_generator_")
+    try:
+        if args.url:
+            base_url, server_pid = args.url.rstrip("/"), args.server_pid
+        else:
+            base_url, processes = launch_backend(args.launch, data_dir.name)
+            server_pid = processes[-1].pid
+        summary = asyncio.run(run_load(base_url, args.dashboards, args.duration, args.speedup, args.arrival,
+                                       args.ramp, parse_mix(args.mix), args.client, server_pid))
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait(timeout=10)
+        data_dir.cleanup()
+
+    summary = {"target": base_url, "dashboards": args.dashboards, "client": args.client,
+               "arrival": args.arrival, "speedup": args.speedup, **summary}
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"{args.dashboards} {args.client} dashboards against {base_url} ({args.arrival} arrival, "
+              f"{args.speedup:g}x time)")
+        print_summary(summary)
+    return 0 if summary["requests"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
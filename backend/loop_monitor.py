@@ -0,0 +1,180 @@
+"""
+Event loop health monitoring and sampling profiler
+A ticker task measures how late the event loop wakes it (loop lag). A
+watchdog thread notices when a tick is overdue, meaning a callback is
+blocking the loop, and captures the loop thread's stack while it is still
+stuck. The profiler samples thread stacks for a few seconds and returns
+them in the collapsed format read by flamegraph.pl and speedscope.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+import traceback
+import logging
+from collections import Counter, deque
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds between loop lag measurements
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.25"))
+
+# A callback holding the loop longer than this is reported with its stack
+SLOW_CALLBACK_THRESHOLD = float(os.getenv("SLOW_CALLBACK_THRESHOLD", "0.1"))
+
+# Lag samples kept for percentiles, and slow callbacks kept for /debug/loop
+LAG_SAMPLES = 1200
+SLOW_EVENTS = 50
+
+# Innermost frames kept per captured stack
+STACK_DEPTH = 40
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def collapse_stack(frame) -> str:
+    """Stack as `outer;...;inner` frame names, the collapsed flamegraph format"""
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def sample_stacks(seconds: float, interval: float, thread_id: Optional[int] = None) -> Counter:
+    """Count the stacks of one thread (or all others) sampled every interval seconds"""
+    counts: Counter = Counter()
+    own = threading.get_ident()
+    names = {t.ident: t.name for t in threading.enumerate()}
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for ident, frame in sys._current_frames().items():
+            if ident == own or (thread_id is not None and ident != thread_id):
+                continue
+            stack = collapse_stack(frame)
+            if thread_id is None:
+                stack = f"{names.get(ident, ident)};{stack}"
+            counts[stack] += 1
+        time.sleep(interval)
+    return counts
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def format_collapsed(counts: Counter) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+
+class LoopMonitor:
+    """Loop lag ticker plus a watchdog thread that catches blocking callbacks"""
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL, threshold: float = SLOW_CALLBACK_THRESHOLD):
+        self.interval = interval
+        self.threshold = threshold
+        self.lags: deque = deque(maxlen=LAG_SAMPLES)
+        self.max_lag = 0.0
+        self.ticks = 0
+        self.slow_callbacks = 0
+        self.slow_events: deque = deque(maxlen=SLOW_EVENTS)
+        self.loop_thread_id: Optional[int] = None
+        # Monotonic time the ticker should next wake up
+        self._due: Optional[float] = None
+        # Stall being reported, so one blocked callback is captured once
+        self._stall: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopped = threading.Event()
+        self._profiling = threading.Lock()
+
+    def start(self):
+        """Start monitoring the running loop"""
+        if self._task is not None:
+            return
+        self.loop_thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._tick())
+        threading.Thread(target=self._watch, name="loop-watchdog", daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _tick(self):
+        while True:
+            self._due = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - self._due)
+            self.ticks += 1
+            self.lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            stall = self._stall
+            if stall is not None:
+                # How late the ticker woke; the block itself may have started earlier
+                stall["lag_ms"] = round(lag * 1000, 1)
+                self._stall = None
+
+    def _watch(self):
+        while not self._stopped.wait(self.threshold / 2):
+            due = self._due
+            if due is None or self._stall is not None:
+                continue
+            overdue = time.monotonic() - due
+            if overdue < self.threshold:
+                continue
+            frame = sys._current_frames().get(self.loop_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.format_stack(frame)[-STACK_DEPTH:]
+            event = {
+                "detected_at": datetime.now().isoformat(),
+                "lag_ms": None,
+                "stack": [line.rstrip() for line in stack],
+            }
+            self._stall = event
+            self.slow_events.append(event)
+            self.slow_callbacks += 1
+            logger.warning(f"Event loop blocked for over {overdue * 1000:.0f}ms in {_frame_name(frame)}")
+
+    def profile(self, seconds: float, interval: float, all_threads: bool = False) -> str:
+        """Sample stacks (the loop thread by default) and return collapsed stack counts
+
+        Blocks for `seconds`, so call it from a worker thread. Only one
+        profile runs at a time; RuntimeError if one is already running.
+        """
+        if not self._profiling.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+        try:
+            thread_id = None if all_threads else self.loop_thread_id or threading.main_thread().ident
+            return format_collapsed(sample_stacks(seconds, interval, thread_id))
+        finally:
+            self._profiling.release()
+
+    def stats(self) -> Dict[str, Any]:
+        ordered = sorted(self.lags)
+        return {
+            "running": self._task is not None,
+            "interval_ms": self.interval * 1000,
+            "slow_callback_threshold_ms": self.threshold * 1000,
+            "ticks": self.ticks,
+            "lag_ms": {
+                "last": round(self.lags[-1] * 1000, 1) if self.lags else None,
+                "p50": round(_percentile(ordered, 0.5) * 1000, 1),
+                "p99": round(_percentile(ordered, 0.99) * 1000, 1),
+                "max": round(self.max_lag * 1000, 1),
+            },
+            "slow_callbacks": self.slow_callbacks,
+        }
+
+    def report(self) -> Dict[str, Any]:
+        """Stats plus the most recent blocking callbacks with their stacks, newest first"""
+        return {**self.stats(), "slow_events": list(reversed(self.slow_events))}
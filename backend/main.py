@@ -1,218 +1,288 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, PlainTextResponse
+from pydantic import BaseModel
 import asyncio
-import aiohttp
 import json
-import re
-from typing import List, Dict, Any
-from datetime import datetime
+from typing import List, Dict, Any, Optional
+from datetime import datetime, date, timedelta
 import logging
+import os
+import time
+import threading
+
+# Only light modules are imported here. aiohttp, BeautifulSoup, numpy and
+# pyarrow are imported where they are first needed, so demo mode never loads
+# them and production mode answers /health before they are all in.
+from demo_pipeline import DemoProcessor
+from headline_generator import headline_generator_from_env
+from loop_monitor import LoopMonitor
+from news_processor import NewsProcessor, SIGNAL_REFRESH_INTERVAL
+from signal_record import SignalStore, signal_id
+from watchlists import Watchlist, WatchlistIndex
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# demo: sample headlines with canned analysis, no network or Ollama
+# production: news feeds and scrapers analyzed by Ollama
+# simulator: sample headlines analyzed through the Ollama API (e.g. ollama_server.py)
+DEMO, PRODUCTION, SIMULATOR = "demo", "production", "simulator"
+APP_MODES = (DEMO, PRODUCTION, SIMULATOR)
+APP_MODE = os.getenv("APP_MODE", PRODUCTION).lower()
+if APP_MODE not in APP_MODES:
+    raise ValueError(f"APP_MODE must be one of {', '.join(APP_MODES)}, got {APP_MODE!r}")
+
+# Demo signals are made up, so they stay out of the archive and search index
+KEEP_HISTORY = APP_MODE != DEMO
+
 app = FastAPI(title="Stock News Analyzer", version="1.0.0")
 
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
+    allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-# In-memory storage for signals
-signals_storage: List[Dict[str, Any]] = []
+# In-memory storage for signals, kept as compact records
+signals_storage = SignalStore()
 
-class NewsProcessor:
-    def __init__(self):
-        self.ollama_url = "http://localhost:11434/api/generate"
-        
-    async def scrape_moneycontrol(self) -> List[str]:
-        """Scrape headlines from MoneyControl"""
+# Columnar signal history on disk, opened on first use
+_signal_archive = None
+
+# Rollups of archive days past the raw retention window
+_signal_retention = None
+
+# Embeddings of every analyzed headline for /search, loaded on first use
+EMBED_MODEL = os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+EMBED_BATCH_SIZE = 64
+_vector_index = None
+
+# First calls come from worker threads, so each object is built under this
+# lock; reentrant because the retention object opens the archive
+_history_lock = threading.RLock()
+
+def get_signal_archive():
+    global _signal_archive
+    if _signal_archive is None:
+        with _history_lock:
+            if _signal_archive is None:
+                from signal_archive import SignalArchive
+                _signal_archive = SignalArchive()
+    return _signal_archive
+
+def get_signal_retention():
+    global _signal_retention
+    if _signal_retention is None:
+        with _history_lock:
+            if _signal_retention is None:
+                from signal_rollups import SignalRetention
+                _signal_retention = SignalRetention(get_signal_archive())
+    return _signal_retention
+
+def get_vector_index():
+    global _vector_index
+    if _vector_index is None:
+        with _history_lock:
+            if _vector_index is None:
+                from vector_index import VectorIndex
+                _vector_index = VectorIndex(EMBED_MODEL)
+    return _vector_index
+
+# Server-side watchlists; new signals are pushed to matching subscribers
+watchlists = WatchlistIndex()
+
+# Loop lag and blocking callbacks, plus the /debug/profile sampler
+loop_monitor = LoopMonitor()
+
+# Longest /debug/profile run
+MAX_PROFILE_SECONDS = 60
+
+# Seconds between keep-alive comments on idle watchlist streams
+STREAM_KEEPALIVE_INTERVAL = 15
+
+# Seconds shutdown waits for the cycle in flight to finish its analyses
+QUEUE_DRAIN_TIMEOUT = float(os.getenv("QUEUE_DRAIN_TIMEOUT", "20"))
+
+def create_processor(mode: str):
+    generator = headline_generator_from_env(SIGNAL_REFRESH_INTERVAL or 300)
+    if mode == DEMO:
+        return DemoProcessor(SIGNAL_REFRESH_INTERVAL or 300, generator)
+    return NewsProcessor(simulated_news=mode == SIMULATOR, generator=generator)
+
+processor = create_processor(APP_MODE)
+
+async def archive_signals(signals: List[Dict[str, Any]]):
+    """Append a cycle's newly announced signals to the Parquet history off the event loop"""
+    try:
+        await asyncio.to_thread(lambda: get_signal_archive().append(signals))
+    except Exception as e:
+        logger.error(f"Failed to archive signals: {e}")
+
+async def index_signals(signals: List[Dict[str, Any]]):
+    """Embed signals not yet in the vector index and append them"""
+    try:
+        vector_index = await asyncio.to_thread(get_vector_index)
+        pending = [s for s in signals if s.get("headline") and not vector_index.contains(s)]
+        for start in range(0, len(pending), EMBED_BATCH_SIZE):
+            batch = pending[start:start + EMBED_BATCH_SIZE]
+            embeddings = await processor.ollama.embed(EMBED_MODEL, [s["headline"] for s in batch])
+            await asyncio.to_thread(vector_index.add, batch, embeddings)
+    except Exception as e:
+        logger.error(f"Failed to index signals for search: {e}")
+
+refresh_lock = asyncio.Lock()
+
+# Set at shutdown: no new cycles start, the one in flight may finish
+draining = asyncio.Event()
+refresh_task: Optional[asyncio.Task] = None
+
+async def refresh_signals():
+    """Run the pipeline once and publish the result as a new snapshot"""
+    async with refresh_lock:
+        if draining.is_set():
+            return
+        signals = await processor.process_headlines()
+        signals_storage.replace(signals)
+        # Each analysis is archived and pushed once, however many snapshots
+        # carry it or how often its headline drops out and comes back
+        fresh = {signal_id(s.get("headline")) for s in processor.claim_unannounced(signals)}
+        added = [record.to_dict() for record in signals_storage if record.id in fresh]
+        watchlists.publish(added)
+        if KEEP_HISTORY and added:
+            asyncio.create_task(archive_signals(added))
+            asyncio.create_task(index_signals(added))
+
+async def retention_loop():
+    """Compact expired history in the background, one archive day per step"""
+    from signal_rollups import RETENTION_INTERVAL
+    while not draining.is_set():
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            async with aiohttp.ClientSession(headers=headers) as session:
-                url = "https://www.moneycontrol.com/news/business/stocks/"
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        
-                        # Use BeautifulSoup for better parsing
-                        from bs4 import BeautifulSoup
-                        soup = BeautifulSoup(html, 'html.parser')
-                        
-                        # Look for common headline patterns
-                        headlines = []
-                        
-                        # Try multiple selectors for headlines
-                        selectors = [
-                            'h2 a',
-                            'h3 a', 
-                            '.news_title a',
-                            '.title a',
-                            'a[href*="/news/"]'
-                        ]
-                        
-                        for selector in selectors:
-                            elements = soup.select(selector)
-                            for element in elements:
-                                text = element.get_text(strip=True)
-                                if text and len(text) > 20 and any(keyword in text.lower() for keyword in ['stock', 'share', 'company', 'profit', 'revenue', 'quarter']):
-                                    headlines.append(text)
-                                    if len(headlines) >= 10:
-                                        break
-                            if len(headlines) >= 10:
-                                break
-                        
-                        return list(set(headlines))[:10]  # Remove duplicates and limit
-                    else:
-                        logger.error(f"Failed to fetch MoneyControl: {response.status}")
-                        return []
+            retention = await asyncio.to_thread(get_signal_retention)
+            # Each step runs in a worker thread and touches one day of files
+            while not draining.is_set() and await asyncio.to_thread(retention.compact_step):
+                pass
         except Exception as e:
-            logger.error(f"Error scraping MoneyControl: {e}")
-            return []
-    
-    async def scrape_zerodha_pulse(self) -> List[str]:
-        """Scrape headlines from Zerodha Pulse"""
+            logger.error(f"Signal retention failed: {e}")
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            async with aiohttp.ClientSession(headers=headers) as session:
-                url = "https://pulse.zerodha.com/"
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        
-                        from bs4 import BeautifulSoup
-                        soup = BeautifulSoup(html, 'html.parser')
-                        
-                        headlines = []
-                        
-                        # Look for post titles and headlines
-                        selectors = [
-                            '.post-title',
-                            '.title',
-                            'h1', 'h2', 'h3',
-                            'a[href*="/post/"]'
-                        ]
-                        
-                        for selector in selectors:
-                            elements = soup.select(selector)
-                            for element in elements:
-                                text = element.get_text(strip=True)
-                                if text and len(text) > 15:
-                                    headlines.append(text)
-                                    if len(headlines) >= 10:
-                                        break
-                            if len(headlines) >= 10:
-                                break
-                        
-                        return list(set(headlines))[:10]
-                    else:
-                        logger.error(f"Failed to fetch Zerodha Pulse: {response.status}")
-                        return []
-        except Exception as e:
-            logger.error(f"Error scraping Zerodha Pulse: {e}")
-            return []
-    
-    async def analyze_with_ollama(self, headline: str) -> Dict[str, Any]:
-        """Send headline to Ollama for analysis"""
-        prompt = f"""Given the following stock news headline, return a JSON object with:
-{{
-  "stock": "<company name>",
-  "event": "<event type>",
-  "sentiment": "positive/negative/neutral",
-  "signal": "buy/sell/hold",
-  "confidence": <score 0-100>,
-  "reason": "<short explanation>"
-}}
-Return only JSON. Do not include commentary.
-Headline: {headline}"""
-
-        payload = {
-            "model": "mistral",
-            "prompt": prompt,
-            "stream": False
-        }
-        
+            await asyncio.wait_for(draining.wait(), RETENTION_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+async def refresh_loop():
+    """Keep the snapshot fresh so delta-sync clients don't need to trigger scraping"""
+    while not draining.is_set():
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(self.ollama_url, json=payload) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        response_text = result.get("response", "")
-                        
-                        # Try to extract JSON from the response
-                        try:
-                            # Find JSON in the response
-                            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                            if json_match:
-                                analysis = json.loads(json_match.group())
-                                analysis["headline"] = headline
-                                analysis["timestamp"] = datetime.now().isoformat()
-                                return analysis
-                            else:
-                                logger.error(f"No JSON found in Ollama response: {response_text}")
-                                return None
-                        except json.JSONDecodeError as e:
-                            logger.error(f"Failed to parse JSON from Ollama: {e}")
-                            logger.error(f"Raw response: {response_text}")
-                            return None
-                    else:
-                        logger.error(f"Ollama request failed: {response.status}")
-                        return None
+            await refresh_signals()
         except Exception as e:
-            logger.error(f"Error calling Ollama: {e}")
-            return None
-    
-    async def process_headlines(self) -> List[Dict[str, Any]]:
-        """Process all headlines and return filtered signals"""
-        # Scrape headlines from both sources
-        mc_headlines = await self.scrape_moneycontrol()
-        zp_headlines = await self.scrape_zerodha_pulse()
-        
-        all_headlines = mc_headlines + zp_headlines
-        logger.info(f"Scraped {len(all_headlines)} headlines total")
-        
-        # Process each headline with Ollama
-        tasks = [self.analyze_with_ollama(headline) for headline in all_headlines]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Filter and clean results
-        valid_signals = []
-        for result in results:
-            if isinstance(result, dict) and result.get("confidence", 0) >= 50:
-                valid_signals.append(result)
-        
-        logger.info(f"Generated {len(valid_signals)} valid signals")
-        return valid_signals
+            logger.error(f"Background refresh failed: {e}")
+        # Wake up when the next source is due for a poll, or at shutdown
+        try:
+            await asyncio.wait_for(draining.wait(), max(1.0, processor.seconds_until_due()))
+        except asyncio.TimeoutError:
+            pass
+
+@app.on_event("startup")
+async def startup():
+    global refresh_task
+    loop_monitor.start()
+    # Load models in the background so the API is up immediately
+    await processor.start()
+    if SIGNAL_REFRESH_INTERVAL > 0:
+        refresh_task = asyncio.create_task(refresh_loop())
+    if KEEP_HISTORY:
+        asyncio.create_task(retention_loop())
 
-processor = NewsProcessor()
+@app.on_event("shutdown")
+async def shutdown():
+    # Stop intake, then give generations already running time to finish;
+    # whatever is cut off stays queued for the next start
+    draining.set()
+    if refresh_task is not None:
+        try:
+            await asyncio.wait_for(refresh_task, QUEUE_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Analyses still running after {QUEUE_DRAIN_TIMEOUT:.0f}s; checkpointed for the next start")
+    await processor.close()
+    loop_monitor.stop()
 
 @app.get("/")
 async def root():
-    return {"message": "Stock News Analyzer API", "status": "running"}
+    return {
+        "message": "Stock News Analyzer API", 
+        "status": "running",
+        "mode": APP_MODE,
+        "endpoints": ["/signals", "/signals/cached", "/signals/changes", "/signals/export", "/search", "/watchlists", "/health", "/stats"],
+        "ollama_status": "checking..."
+    }
+
+@app.get("/health")
+async def health_check():
+    """Comprehensive health check"""
+    try:
+        return {
+            "status": "healthy",
+            "timestamp": datetime.now().isoformat(),
+            "mode": APP_MODE,
+            **await processor.health(),
+            "cached_signals": len(signals_storage)
+        }
+    except Exception as e:
+        return {"status": "unhealthy", "error": str(e)}
+
+@app.get("/stats")
+async def get_stats():
+    """Analysis pipeline metrics"""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "mode": APP_MODE,
+        **processor.stats(),
+        # Not opened yet means nothing has been archived or indexed this run
+        "archive": _signal_archive.stats() if _signal_archive is not None else None,
+        "search_index": _vector_index.stats() if _vector_index is not None else None,
+        "retention": _signal_retention.stats() if _signal_retention is not None else None,
+        "watchlists": watchlists.stats(),
+        "event_loop": loop_monitor.stats()
+    }
+
+@app.get("/debug/loop")
+async def debug_loop():
+    """Event loop lag and the latest callbacks that blocked it, with their stacks"""
+    return {"timestamp": datetime.now().isoformat(), **loop_monitor.report()}
+
+@app.get("/debug/profile")
+async def debug_profile(seconds: float = 10, interval_ms: float = 5, all_threads: bool = False):
+    """Sample stacks for a while and return them as collapsed stacks
+
+    The output feeds straight into flamegraph.pl or speedscope. Only the
+    event loop thread is sampled unless all_threads is set, which also
+    covers asyncio.to_thread workers.
+    """
+    seconds = min(max(seconds, 0.1), MAX_PROFILE_SECONDS)
+    interval = min(max(interval_ms, 1), 1000) / 1000
+    try:
+        output = await asyncio.to_thread(loop_monitor.profile, seconds, interval, all_threads)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return PlainTextResponse(output)
 
 @app.get("/signals")
 async def get_signals():
-    """Trigger scraping and return trade signals"""
+    """Poll the sources that are due and return trade signals"""
     try:
-        signals = await processor.process_headlines()
-        
-        # Update in-memory storage
-        global signals_storage
-        signals_storage = signals
+        await refresh_signals()
         
         return {
-            "signals": signals,
-            "count": len(signals),
-            "timestamp": datetime.now().isoformat()
+            "signals": signals_storage.to_dicts(),
+            "count": len(signals_storage),
+            "version": signals_storage.version,
+            "timestamp": datetime.now().isoformat(),
+            "mode": APP_MODE,
+            "degraded": processor.is_degraded()
         }
     except Exception as e:
         logger.error(f"Error processing signals: {e}")
@@ -220,13 +290,182 @@ async def get_signals():
 
 @app.get("/signals/cached")
 async def get_cached_signals():
-    """Return cached signals without triggering new scraping"""
+    """Return cached signals without new processing"""
     return {
-        "signals": signals_storage,
+        "signals": signals_storage.to_dicts(),
         "count": len(signals_storage),
+        "version": signals_storage.version,
+        "timestamp": datetime.now().isoformat(),
+        "mode": "cached"
+    }
+
+@app.get("/signals/changes")
+async def get_signal_changes(since: int = 0, timeout: float = 30):
+    """Signals added or removed since a snapshot version
+
+    Waits up to `timeout` seconds (max 60) for a change when the client is
+    already current. `reset` means `added` is the full snapshot.
+    """
+    await signals_storage.wait_for_change(since, min(max(timeout, 0), 60))
+    reset, added, removed = signals_storage.changes_since(since)
+    return {
+        "version": signals_storage.version,
+        "reset": reset,
+        "added": added,
+        "removed": removed,
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/signals/export")
+async def export_signals(start: Optional[date] = None, end: Optional[date] = None, format: str = "arrow"):
+    """Stream archived signal history as Arrow IPC or Parquet"""
+    signal_archive = get_signal_archive()
+    if format == "arrow":
+        return StreamingResponse(
+            signal_archive.stream_arrow(start, end),
+            media_type="application/vnd.apache.arrow.stream",
+            headers={"Content-Disposition": 'attachment; filename="signals.arrows"'}
+        )
+    if format == "parquet":
+        return StreamingResponse(
+            signal_archive.stream_parquet(start, end),
+            media_type="application/vnd.apache.parquet",
+            headers={"Content-Disposition": 'attachment; filename="signals.parquet"'}
+        )
+    raise HTTPException(status_code=400, detail="format must be 'arrow' or 'parquet'")
+
+@app.get("/signals/history")
+async def signal_history(start: Optional[date] = None, end: Optional[date] = None, grain: str = "day",
+                         stock: Optional[str] = None):
+    """Per-stock signal counts, sentiment mix and mean confidence per hour or day
+
+    Defaults to the last 30 days. Older history comes from rollups, so
+    ranges spanning years cost about the same as a few weeks.
+    """
+    if grain not in ("hour", "day"):
+        raise HTTPException(status_code=400, detail="grain must be 'hour' or 'day'")
+    end = end or date.today()
+    start = start or end - timedelta(days=30)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    started = time.perf_counter()
+    retention = await asyncio.to_thread(get_signal_retention)
+    buckets = await asyncio.to_thread(retention.query, start, end, grain, stock)
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "grain": grain,
+        "buckets": buckets,
+        "count": len(buckets),
+        "took_ms": round((time.perf_counter() - started) * 1000, 1),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/search")
+async def search_signals(q: str, k: int = 10, days: Optional[float] = None):
+    """Signals whose headlines are semantically closest to the query
+
+    `days` limits results to signals from the last N days.
+    """
+    if APP_MODE == DEMO:
+        raise HTTPException(status_code=503, detail="Search needs Ollama embeddings and is not available in demo mode")
+    from ollama_client import OllamaUnavailable
+    
+    started = time.perf_counter()
+    vector_index = await asyncio.to_thread(get_vector_index)
+    try:
+        query = (await processor.ollama.embed(EMBED_MODEL, [q]))[0]
+    except (OllamaUnavailable, ValueError) as e:
+        raise HTTPException(status_code=503, detail=f"Embedding model unavailable: {e}")
+    since = datetime.now() - timedelta(days=days) if days is not None else None
+    try:
+        # Large indexes take tens of milliseconds to scan; keep the loop free
+        matches = await asyncio.to_thread(vector_index.search, query, min(max(k, 1), 100), since)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {
+        "query": q,
+        "results": [dict(signal, score=round(score, 4)) for score, signal in matches],
+        "count": len(matches),
+        "indexed": len(vector_index),
+        "took_ms": round((time.perf_counter() - started) * 1000, 1),
+        "timestamp": datetime.now().isoformat()
+    }
+
+class WatchlistRequest(BaseModel):
+    stocks: List[str] = []
+    events: List[str] = []
+    min_confidence: int = 0
+
+def get_watchlist_or_404(watchlist_id: str) -> Watchlist:
+    watchlist = watchlists.get(watchlist_id)
+    if watchlist is None:
+        raise HTTPException(status_code=404, detail="Watchlist not found")
+    return watchlist
+
+@app.post("/watchlists")
+async def create_watchlist(request: WatchlistRequest):
+    """Register stocks, event types and a minimum confidence to be pushed signals for"""
+    watchlist = watchlists.add(Watchlist(request.stocks, request.events, request.min_confidence))
+    return watchlist.to_dict()
+
+@app.get("/watchlists/{watchlist_id}")
+async def get_watchlist(watchlist_id: str):
+    """Watchlist criteria and the current signals that match them"""
+    watchlist = get_watchlist_or_404(watchlist_id)
+    matching = [s for s in signals_storage.to_dicts() if watchlist_id in watchlists.match(s)]
+    return dict(watchlist.to_dict(), signals=matching)
+
+@app.delete("/watchlists/{watchlist_id}")
+async def delete_watchlist(watchlist_id: str):
+    if not watchlists.remove(watchlist_id):
+        raise HTTPException(status_code=404, detail="Watchlist not found")
+    return {"deleted": watchlist_id}
+
+@app.get("/watchlists/{watchlist_id}/stream")
+async def stream_watchlist(watchlist_id: str):
+    """Server-sent events with each new signal matching the watchlist"""
+    get_watchlist_or_404(watchlist_id)
+    subscription = watchlists.subscribe(watchlist_id)
+
+    async def events():
+        try:
+            while True:
+                try:
+                    signal = await asyncio.wait_for(subscription.queue.get(), STREAM_KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                if signal is None:
+                    return
+                yield f"id: {signal['id']}\nevent: signal\ndata: {json.dumps(signal)}\n\n"
+        finally:
+            watchlists.unsubscribe(subscription)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.websocket("/watchlists/{watchlist_id}/ws")
+async def watchlist_socket(websocket: WebSocket, watchlist_id: str):
+    """WebSocket carrying each new signal matching the watchlist as JSON"""
+    if watchlists.get(watchlist_id) is None:
+        await websocket.close(code=4404)
+        return
+    await websocket.accept()
+    subscription = watchlists.subscribe(watchlist_id)
+    try:
+        while True:
+            signal = await subscription.queue.get()
+            if signal is None:
+                await websocket.close()
+                return
+            await websocket.send_json(signal)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        watchlists.unsubscribe(subscription)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
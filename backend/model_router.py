@@ -0,0 +1,153 @@
+"""
+Model routing cascade for headline analysis
+Cheap tiers (keyword analyzer or a small Ollama model) see every headline;
+only low-confidence, failed or disputed results are escalated to larger models.
+"""
+
+import os
+import time
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+
+from keyword_analyzer import IntelligentAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# Tier name that routes to the in-process keyword analyzer instead of Ollama
+KEYWORD_TIER = "keyword"
+
+DEFAULT_TIERS = os.getenv("OLLAMA_MODEL_TIERS", "mistral")
+DEFAULT_CONFIDENCE_THRESHOLD = int(os.getenv("ROUTER_CONFIDENCE_THRESHOLD", "70"))
+DEFAULT_ESCALATE_ON_DISAGREEMENT = os.getenv("ROUTER_ESCALATE_ON_DISAGREEMENT", "true").lower() == "true"
+
+ModelCall = Callable[[str, str], Awaitable[Optional[Dict[str, Any]]]]
+
+
+def parse_tiers(value: str) -> List[str]:
+    """Parse a comma separated tier list, cheapest first"""
+    return [tier.strip() for tier in value.split(",") if tier.strip()]
+
+
+class TierStats:
+    """Latency and outcome counters for one routing tier"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.failures = 0
+        self.escalations = 0
+        self.total_latency = 0.0
+        # Agreement with the previous tier when a headline was escalated here
+        self.comparisons = 0
+        self.agreements = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tier": self.name,
+            "calls": self.calls,
+            "failures": self.failures,
+            "escalations": self.escalations,
+            "escalation_rate": round(self.escalations / self.calls, 3) if self.calls else 0.0,
+            "avg_latency_ms": round(self.total_latency / self.calls * 1000, 1) if self.calls else 0.0,
+            "agreement_rate": round(self.agreements / self.comparisons, 3) if self.comparisons else None,
+        }
+
+
+class ModelRouter:
+    """Run each headline through the cheapest tier first and escalate on doubt"""
+
+    def __init__(self, call_model: ModelCall, tiers: Optional[List[str]] = None,
+                 confidence_threshold: int = DEFAULT_CONFIDENCE_THRESHOLD,
+                 escalate_on_disagreement: bool = DEFAULT_ESCALATE_ON_DISAGREEMENT):
+        self.call_model = call_model
+        self.tiers = tiers or parse_tiers(DEFAULT_TIERS)
+        self.confidence_threshold = confidence_threshold
+        self.escalate_on_disagreement = escalate_on_disagreement
+        self.keyword_analyzer = IntelligentAnalyzer()
+        self.tier_stats = {tier: TierStats(tier) for tier in self.tiers}
+        self.headlines = 0
+        self.total_latency = 0.0
+
+    def analyze_with_keywords(self, headline: str) -> Dict[str, Any]:
+        """Keyword analyzer result in the same shape as a model result
+
+        Scored deterministically, so escalation and tier agreement reflect
+        the headline rather than chance.
+        """
+        analysis = self.keyword_analyzer.analyze_headline(headline, deterministic=True)
+        analysis["headline"] = headline
+        analysis["timestamp"] = datetime.now().isoformat()
+        analysis["source"] = "keyword"
+        return analysis
+
+    async def _run_tier(self, tier: str, headline: str) -> Optional[Dict[str, Any]]:
+        if tier == KEYWORD_TIER:
+            return self.analyze_with_keywords(headline)
+        return await self.call_model(headline, tier)
+
+    def _escalation_reason(self, tier: str, analysis: Optional[Dict[str, Any]], headline: str) -> Optional[str]:
+        """Return why a tier result should be escalated, or None to accept it"""
+        if analysis is None:
+            return "failed"
+        try:
+            confidence = float(analysis.get("confidence", 0))
+        except (TypeError, ValueError):
+            return "invalid"
+        if confidence < self.confidence_threshold:
+            return "low_confidence"
+        if self.escalate_on_disagreement and tier != KEYWORD_TIER:
+            # The keyword sentiment is deterministic and costs microseconds,
+            # so use it as a second opinion on small-model output
+            reference = self.keyword_analyzer.analyze_sentiment(headline)
+            if {reference, analysis.get("sentiment")} == {"positive", "negative"}:
+                return "disagreement"
+        return None
+
+    async def analyze(self, headline: str) -> Optional[Dict[str, Any]]:
+        """Analyze a headline through the tier cascade"""
+        started = time.perf_counter()
+        accepted = None
+        previous = None
+
+        for index, tier in enumerate(self.tiers):
+            stats = self.tier_stats[tier]
+            tier_started = time.perf_counter()
+            analysis = await self._run_tier(tier, headline)
+            stats.calls += 1
+            stats.total_latency += time.perf_counter() - tier_started
+
+            if analysis is None:
+                stats.failures += 1
+            else:
+                analysis["model"] = tier
+                if previous is not None:
+                    stats.comparisons += 1
+                    if previous.get("signal") == analysis.get("signal"):
+                        stats.agreements += 1
+                previous = analysis
+
+            is_last = index == len(self.tiers) - 1
+            reason = None if is_last else self._escalation_reason(tier, analysis, headline)
+            if reason is None:
+                # The last tier's failure falls back to the best earlier answer
+                accepted = analysis or previous
+                break
+
+            stats.escalations += 1
+            logger.debug(f"Escalating from {tier} ({reason}): {headline}")
+
+        self.headlines += 1
+        self.total_latency += time.perf_counter() - started
+        return accepted
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-tier latency, escalation and agreement metrics"""
+        first = self.tier_stats[self.tiers[0]] if self.tiers else None
+        return {
+            "tiers": [self.tier_stats[tier].to_dict() for tier in self.tiers],
+            "confidence_threshold": self.confidence_threshold,
+            "headlines": self.headlines,
+            "escalation_rate": round(first.escalations / first.calls, 3) if first and first.calls else 0.0,
+            "avg_latency_ms": round(self.total_latency / self.headlines * 1000, 1) if self.headlines else 0.0,
+        }
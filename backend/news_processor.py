@@ -0,0 +1,427 @@
+"""
+News processing pipeline
+Polls the news sources that are due, queues their items durably and runs
+each through the model routing cascade, falling back to keyword analysis
+while Ollama is down. Importing this module has no side effects, so tools
+such as bulk_analyze.py and cassette.py can build their own processor
+without starting the API app in main.py.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from datetime import datetime
+from functools import partial
+from typing import List, Dict, Any, Optional
+
+# aiohttp, BeautifulSoup and the Ollama client are imported when a
+# processor is created, so importing this module stays cheap
+from circuit_breaker import CircuitBreaker, CLOSED
+from concurrency_limiter import AdaptiveLimiter
+from demo_pipeline import sample_headlines
+from feed_reader import FeedItem, FeedSource, feed_sources_from_env
+from headline_generator import HeadlineGenerator, HEADLINES_PER_CYCLE
+from model_router import ModelRouter, KEYWORD_TIER
+from source_scheduler import AdaptivePoller
+from work_queue import WorkQueue, DEFAULT_QUEUE_FILE
+
+logger = logging.getLogger(__name__)
+
+# Seconds between background refreshes of the signal snapshot (0 disables)
+SIGNAL_REFRESH_INTERVAL = float(os.getenv("SIGNAL_REFRESH_INTERVAL", "300"))
+
+# Analyses below this confidence are not published as signals
+SIGNAL_MIN_CONFIDENCE = 50
+
+# Headlines analyzed per cycle, plus queued jobs carried over from earlier runs
+MAX_ANALYSES_PER_CYCLE = 15
+QUEUE_RECOVERY_BATCH = 5
+
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("OLLAMA_BREAKER_THRESHOLD", "3"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("OLLAMA_BREAKER_RESET", "30"))
+
+
+class NewsProcessor:
+    def __init__(self, simulated_news: bool = False, queue_path: Optional[str] = DEFAULT_QUEUE_FILE,
+                 cassette=None, generator: Optional[HeadlineGenerator] = None):
+        from fetch_scheduler import FetchScheduler
+        from ollama_client import OllamaClient
+        from cassette import cassette_clients, cassette_from_env
+
+        # A cassette records source and Ollama traffic, or replays it offline
+        cassette = cassette or cassette_from_env()
+        if cassette is not None:
+            self.fetcher, self.ollama = cassette_clients(cassette)
+        else:
+            # Rate-limited fetching shared by all news sources
+            self.fetcher = FetchScheduler()
+            self.ollama = OllamaClient()
+        self.router = ModelRouter(self.analyze_with_ollama)
+        # Trips when Ollama as a whole is unreachable, across all endpoints
+        self.breaker = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT)
+        self.fallbacks = 0
+        # Self-tuning cap on concurrent Ollama generations
+        self.limiter = AdaptiveLimiter()
+        # RSS/Atom/JSON feeds, with HTML scraping for sites without a working feed
+        self.feeds = feed_sources_from_env()
+        self.html_scrapers = {
+            "moneycontrol": self.scrape_moneycontrol,
+            "financialexpress": self.scrape_financial_express,
+        }
+        # Analyses of the items in the last snapshot, reused while they stay in their feed
+        self.item_analyses: Dict[str, Dict[str, Any]] = {}
+        # First keyword fallback of each item, kept until a model result replaces it
+        # so an outage doesn't produce a different call every cycle
+        self.fallback_analyses: Dict[str, Dict[str, Any]] = {}
+        # Items are queued on disk before analysis so restarts lose no work
+        self.queue = WorkQueue(queue_path)
+        # Per-source poll intervals adapted to how much each source yields
+        self.poller = AdaptivePoller(SIGNAL_REFRESH_INTERVAL or 300)
+        # Latest items from each source, kept between that source's polls
+        self.source_items: Dict[str, List[FeedItem]] = {}
+        # Job of each of the last cycle's signals, by headline
+        self.signal_guids: Dict[str, str] = {}
+        # Simulator mode reads sample headlines instead of the news sites
+        self.simulated_news = simulated_news
+        # Synthetic headlines in place of the samples
+        self.generator = generator
+        
+    async def scrape_moneycontrol(self) -> List[str]:
+        """Scrape headlines from MoneyControl"""
+        try:
+            html = await self.fetcher.fetch("https://www.moneycontrol.com/news/business/stocks/")
+            if html is None:
+                return []
+            from bs4 import BeautifulSoup
+            soup = BeautifulSoup(html, 'html.parser')
+            
+            headlines = []
+            selectors = [
+                'h2 a', 'h3 a', '.news_title a', '.title a',
+                'a[href*="/news/"]', '.headline a'
+            ]
+            
+            for selector in selectors:
+                elements = soup.select(selector)
+                for element in elements:
+                    text = element.get_text(strip=True)
+                    if (text and len(text) > 20 and 
+                        any(keyword in text.lower() for keyword in 
+                            ['stock', 'share', 'company', 'profit', 'revenue', 'quarter', 'earnings'])):
+                        headlines.append(text)
+                        if len(headlines) >= 15:
+                            break
+                if len(headlines) >= 15:
+                    break
+            
+            logger.info(f"Scraped {len(headlines)} headlines from MoneyControl")
+            return list(set(headlines))[:10]
+        except Exception as e:
+            logger.error(f"Error scraping MoneyControl: {e}")
+            return []
+    
+    async def scrape_financial_express(self) -> List[str]:
+        """Scrape headlines from Financial Express as alternative"""
+        try:
+            html = await self.fetcher.fetch("https://www.financialexpress.com/market/")
+            if html is None:
+                return []
+            from bs4 import BeautifulSoup
+            soup = BeautifulSoup(html, 'html.parser')
+            
+            headlines = []
+            selectors = ['h2 a', 'h3 a', '.story-title a', '.title a']
+            
+            for selector in selectors:
+                elements = soup.select(selector)
+                for element in elements:
+                    text = element.get_text(strip=True)
+                    if text and len(text) > 20:
+                        headlines.append(text)
+                        if len(headlines) >= 10:
+                            break
+                if len(headlines) >= 10:
+                    break
+            
+            logger.info(f"Scraped {len(headlines)} headlines from Financial Express")
+            return list(set(headlines))[:10]
+        except Exception as e:
+            logger.error(f"Error scraping Financial Express: {e}")
+            return []
+    
+    async def read_feed(self, feed: FeedSource) -> Optional[List[FeedItem]]:
+        """Latest items from a feed, scraping the site's HTML if the feed can't be read"""
+        items = await feed.poll(self.fetcher)
+        if items is not None:
+            return items
+        scraper = self.html_scrapers.get(feed.name)
+        if scraper is None:
+            return None
+        logger.info(f"Falling back to HTML scraping for {feed.name}")
+        return await self.scrape_items(feed.name, scraper)
+    
+    async def scrape_items(self, name: str, scraper) -> Optional[List[FeedItem]]:
+        """Run an HTML scraper, keyed by headline since pages carry no GUIDs"""
+        headlines = await scraper()
+        if not headlines:
+            # Fetch failed or the selectors no longer match the page
+            return None
+        previous = {item.guid for item in self.source_items.get(name, [])}
+        items = [FeedItem(headline, headline, source=name) for headline in headlines]
+        for item in items:
+            item.is_new = item.guid not in previous
+        return items
+    
+    async def read_generated(self) -> List[FeedItem]:
+        """Next batch of synthetic headlines, like one poll of a busy feed"""
+        return [h.to_feed_item("generated") for h in self.generator.take(HEADLINES_PER_CYCLE)]
+    
+    def source_readers(self) -> Dict[str, Any]:
+        """Poll function for every source by name"""
+        if self.simulated_news and self.generator is not None:
+            return {"generated": self.read_generated}
+        if self.simulated_news:
+            return {"samples": partial(self.scrape_items, "samples", sample_headlines)}
+        readers = {feed.name: partial(self.read_feed, feed) for feed in self.feeds}
+        for name, scraper in self.html_scrapers.items():
+            if name not in readers:
+                readers[name] = partial(self.scrape_items, name, scraper)
+        return readers
+    
+    async def poll_source(self, name: str, read):
+        items = await read()
+        self.poller.record_poll(name, items)
+        if items is not None:
+            self.source_items[name] = items
+    
+    async def collect_headlines(self) -> List[FeedItem]:
+        """Poll the sources that are due concurrently and return unique items, newest first"""
+        readers = self.source_readers()
+        due = self.poller.due(readers)
+        await asyncio.gather(*(self.poll_source(name, readers[name]) for name in due))
+        
+        unique: Dict[str, FeedItem] = {}
+        for name in readers:
+            for item in self.source_items.get(name, []):
+                unique.setdefault(item.title, item)
+        # New items first, then by publication time; scraped headlines have none
+        return sorted(unique.values(), key=lambda item: (
+            not item.is_new, -(item.published.timestamp() if item.published else 0)
+        ))
+    
+    async def analyze_with_ollama(self, headline: str, model: str = "mistral") -> Dict[str, Any]:
+        """Send headline to Ollama for analysis"""
+        from ollama_client import OllamaUnavailable, ANALYSIS_SYSTEM_PROMPT, build_analysis_prompt
+        
+        if not self.breaker.allow_request():
+            # Fail fast while Ollama is known to be down
+            return None
+        
+        options = {
+            "temperature": 0.1,
+            "top_p": 0.9
+        }
+        
+        try:
+            try:
+                await self.limiter.acquire()
+            except BaseException:
+                # Cancelled while waiting for a slot: a half-open probe must not stay claimed
+                self.breaker.release_probe()
+                raise
+            started = time.perf_counter()
+            try:
+                result = await self.ollama.generate(
+                    model, build_analysis_prompt(headline), system=ANALYSIS_SYSTEM_PROMPT, options=options
+                )
+            except (OllamaUnavailable, asyncio.TimeoutError) as e:
+                self.breaker.record_failure()
+                # Timeouts signal overload; refused connections say nothing about load
+                timed_out = isinstance(e, asyncio.TimeoutError) or getattr(e, "timed_out", False)
+                if timed_out:
+                    await self.limiter.release(time.perf_counter() - started, dropped=True)
+                else:
+                    await self.limiter.release(None)
+                raise
+            except Exception:
+                # An unusable response counts against Ollama like an outage
+                self.breaker.record_failure()
+                await self.limiter.release(None)
+                raise
+            except BaseException:
+                # Cancelled: no verdict on Ollama, but a half-open probe must not stay claimed
+                self.breaker.release_probe()
+                await self.limiter.release(None)
+                raise
+            await self.limiter.release(time.perf_counter() - started)
+            self.breaker.record_success()
+            if result is None:
+                return None
+            response_text = result.get("response", "")
+            
+            # Extract JSON from response
+            try:
+                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+                if json_match:
+                    analysis = json.loads(json_match.group())
+                    
+                    # Validate required fields
+                    required_fields = ["stock", "event", "sentiment", "signal", "confidence", "reason"]
+                    if all(field in analysis for field in required_fields):
+                        analysis["headline"] = headline
+                        analysis["timestamp"] = datetime.now().isoformat()
+                        analysis["source"] = "ollama"
+                        return analysis
+                    else:
+                        logger.error(f"Missing required fields in analysis: {analysis}")
+                        return None
+                else:
+                    logger.error(f"No JSON found in Ollama response: {response_text}")
+                    return None
+            except json.JSONDecodeError as e:
+                logger.error(f"Failed to parse JSON from Ollama: {e}")
+                return None
+        except Exception as e:
+            logger.error(f"Error calling Ollama: {e}")
+            return None
+    
+    async def start(self):
+        """Recover queued work, begin Ollama health checks and load models in the background"""
+        self.queue.recover()
+        self.ollama.start_health_checks()
+        asyncio.create_task(self.warm_up())
+    
+    async def close(self):
+        await self.ollama.close()
+        await self.fetcher.close()
+        self.queue.close()
+    
+    def seconds_until_due(self) -> float:
+        return self.poller.seconds_until_due()
+    
+    async def health(self) -> Dict[str, Any]:
+        """Connectivity of every configured Ollama endpoint"""
+        endpoints = await self.ollama.check_health()
+        return {
+            "ollama": "connected" if any(e["healthy"] for e in endpoints) else "disconnected",
+            "ollama_endpoints": endpoints,
+            "ollama_breaker": self.breaker.state,
+        }
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "routing": self.router.stats(),
+            "ollama": self.ollama.stats(),
+            "breaker": self.breaker.to_dict(),
+            "concurrency": self.limiter.stats(),
+            "keyword_fallbacks": self.fallbacks,
+            "fetching": self.fetcher.stats(),
+            "feeds": [feed.to_dict() for feed in self.feeds],
+            "sources": self.poller.stats(),
+            "analysis_queue": self.queue.stats(),
+            **({"headline_generator": self.generator.stats()} if self.generator is not None else {}),
+        }
+    
+    async def warm_up(self):
+        """Load every Ollama model used by the routing tiers"""
+        for tier in self.router.tiers:
+            if tier != KEYWORD_TIER:
+                await self.ollama.warm_up(tier)
+    
+    def is_degraded(self) -> bool:
+        """True while Ollama is unreachable and keyword analysis stands in"""
+        if self.breaker.state != CLOSED or not self.ollama.is_available():
+            return True
+        # Failures since the last success mean Ollama could not be reached,
+        # even before enough of them have piled up to trip the breaker
+        return self.breaker.consecutive_failures > 0
+    
+    async def analyze_headline(self, headline: str) -> Dict[str, Any]:
+        """Analyze a headline, falling back to keyword analysis during outages"""
+        analysis = await self.router.analyze(headline)
+        if analysis is None and self.is_degraded():
+            analysis = self.router.analyze_with_keywords(headline)
+            analysis["source"] = "keyword_fallback"
+            self.fallbacks += 1
+        return analysis
+    
+    async def analyze_item(self, item: FeedItem) -> Optional[Dict[str, Any]]:
+        """Analyze a queued feed item, reusing its analysis from an earlier cycle or run"""
+        cached = self.item_analyses.get(item.guid) or self.queue.result(item.guid)
+        if cached is not None:
+            self.item_analyses[item.guid] = cached
+            return dict(cached)
+        if not self.queue.lease(item.guid):
+            # Parked after repeated failures
+            return None
+        started = time.perf_counter()
+        try:
+            analysis = await self.analyze_headline(item.title)
+        except BaseException:
+            # Includes cancellation at shutdown; the job is picked up again later
+            self.queue.release(item.guid)
+            raise
+        is_signal = analysis is not None and analysis.get("confidence", 0) >= SIGNAL_MIN_CONFIDENCE
+        self.poller.record_analysis(item.source, time.perf_counter() - started, is_signal)
+        if analysis is None:
+            self.queue.release(item.guid, failed=True)
+            return None
+        if item.published is not None:
+            analysis["published"] = item.published.isoformat()
+        if item.link:
+            analysis["link"] = item.link
+        # Keyword fallbacks are redone once Ollama is back
+        if analysis.get("source") == "keyword_fallback":
+            self.queue.release(item.guid)
+            return dict(self.fallback_analyses.setdefault(item.guid, analysis))
+        self.queue.complete(item.guid, analysis)
+        self.item_analyses[item.guid] = analysis
+        self.fallback_analyses.pop(item.guid, None)
+        return analysis
+    
+    async def process_headlines(self) -> List[Dict[str, Any]]:
+        """Process all headlines and return filtered signals"""
+        # Fetch due sources concurrently; the scheduler keeps each domain polite
+        items = await self.collect_headlines()
+        
+        logger.info(f"Processing {len(items)} unique headlines")
+        
+        # Persist the work before any generation starts, then add jobs an
+        # earlier run left unfinished
+        selected = items[:MAX_ANALYSES_PER_CYCLE]
+        self.queue.enqueue(selected)
+        current = {item.guid for item in selected}
+        selected += self.queue.pending(QUEUE_RECOVERY_BATCH, exclude=current)
+        current.update(item.guid for item in selected)
+        self.queue.prune()
+        
+        # Process headlines through the model routing cascade
+        tasks = [self.analyze_item(item) for item in selected]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        self.item_analyses = {guid: a for guid, a in self.item_analyses.items() if guid in current}
+        self.fallback_analyses = {guid: a for guid, a in self.fallback_analyses.items() if guid in current}
+        
+        # Filter valid signals
+        valid_signals = []
+        self.signal_guids = {}
+        for item, result in zip(selected, results):
+            if isinstance(result, dict) and result.get("confidence", 0) >= SIGNAL_MIN_CONFIDENCE:
+                valid_signals.append(result)
+                self.signal_guids[result.get("headline")] = item.guid
+            elif isinstance(result, Exception):
+                logger.error(f"Analysis failed: {result}")
+        
+        logger.info(f"Generated {len(valid_signals)} valid signals from {len(selected)} headlines")
+        return valid_signals
+    
+    def claim_unannounced(self, signals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Signals from the last cycle whose analysis was never archived or published, marked as now"""
+        fresh = []
+        for signal in signals:
+            guid = self.signal_guids.get(signal.get("headline"))
+            if guid is None or self.queue.announce(guid, signal):
+                fresh.append(signal)
+        return fresh
@@ -0,0 +1,322 @@
+"""
+Ollama HTTP client
+Balances requests over a pool of Ollama hosts, keeps models resident with
+keep_alive, reuses one connection pool and tracks cold (model load) versus
+warm generation latency.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional
+
+import aiohttp
+
+from circuit_breaker import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+DEFAULT_HEALTH_INTERVAL = float(os.getenv("OLLAMA_HEALTH_INTERVAL", "15"))
+DEFAULT_CONNECT_TIMEOUT = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "3"))
+
+# Ollama reports model load time in nanoseconds; anything above this means
+# the model was not resident when the request arrived
+COLD_LOAD_THRESHOLD_NS = 250_000_000
+
+# Static instruction prefix sent as the system prompt. It is byte-identical
+# on every request so Ollama can reuse its evaluated prefix between calls.
+ANALYSIS_SYSTEM_PROMPT = """You analyze stock news headlines. Given a headline, return a JSON object with:
+{
+  "stock": "<company name>",
+  "event": "<event type>",
+  "sentiment": "positive/negative/neutral",
+  "signal": "buy/sell/hold",
+  "confidence": <score 0-100>,
+  "reason": "<short explanation>"
+}
+Return only JSON. Do not include commentary."""
+
+
+def ollama_urls_from_env() -> List[str]:
+    """Ollama base URLs from OLLAMA_URLS (comma separated) or OLLAMA_URL"""
+    value = os.getenv("OLLAMA_URLS") or os.getenv("OLLAMA_URL") or "http://localhost:11434"
+    urls = []
+    for url in value.split(","):
+        url = url.strip().rstrip("/")
+        # Older docs point OLLAMA_URL at the generate endpoint itself
+        if url.endswith("/api/generate"):
+            url = url[:-len("/api/generate")]
+        if url:
+            urls.append(url)
+    return urls
+
+
+class OllamaUnavailable(Exception):
+    """No Ollama endpoint could serve the request"""
+
+    def __init__(self, message: str, timed_out: bool = False):
+        super().__init__(message)
+        # True when the last endpoint tried timed out rather than refused
+        self.timed_out = timed_out
+
+
+def build_analysis_prompt(headline: str) -> str:
+    """Per-headline part of the prompt; everything static lives in the system prompt"""
+    return f"Headline: {headline}"
+
+
+class LatencyStats:
+    """Call count and latency totals for one class of request"""
+
+    def __init__(self):
+        self.calls = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record(self, latency: float):
+        self.calls += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "avg_latency_ms": round(self.total_latency / self.calls * 1000, 1) if self.calls else 0.0,
+            "max_latency_ms": round(self.max_latency * 1000, 1),
+        }
+
+
+class OllamaEndpoint:
+    """One Ollama host with its own breaker and load counters"""
+
+    def __init__(self, base_url: str, breaker: CircuitBreaker):
+        self.base_url = base_url
+        self.breaker = breaker
+        self.healthy = True
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def generate_url(self) -> str:
+        return f"{self.base_url}/api/generate"
+
+    @property
+    def embed_url(self) -> str:
+        return f"{self.base_url}/api/embed"
+
+    @property
+    def tags_url(self) -> str:
+        return f"{self.base_url}/api/tags"
+
+    def is_available(self) -> bool:
+        return self.healthy and self.breaker.is_available()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.base_url,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "breaker": self.breaker.to_dict(),
+        }
+
+
+class OllamaClient:
+    """Async client for the Ollama generate API over a pool of hosts"""
+
+    def __init__(self, base_urls: Optional[List[str]] = None, keep_alive: str = DEFAULT_KEEP_ALIVE,
+                 timeout: float = 30, connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 health_interval: float = DEFAULT_HEALTH_INTERVAL):
+        self.endpoints = [
+            OllamaEndpoint(url, CircuitBreaker()) for url in (base_urls or ollama_urls_from_env())
+        ]
+        self.keep_alive = keep_alive
+        # A short connect timeout makes an unreachable host fail in seconds
+        # instead of waiting out the full generation timeout
+        self.timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=connect_timeout)
+        self.health_interval = health_interval
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.cold = LatencyStats()
+        self.warm = LatencyStats()
+        self.warmed_models = set()
+        self._health_task: Optional[asyncio.Task] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(timeout=self.timeout)
+        return self.session
+
+    def _pick_endpoint(self, exclude: List[OllamaEndpoint]) -> Optional[OllamaEndpoint]:
+        """Least-outstanding-requests choice among available endpoints"""
+        candidates = [e for e in self.endpoints if e not in exclude and e.is_available()]
+        for endpoint in sorted(candidates, key=lambda e: e.outstanding):
+            if endpoint.breaker.allow_request():
+                return endpoint
+        return None
+
+    def _record(self, model: str, latency: float, result: Dict[str, Any]):
+        load_duration = result.get("load_duration")
+        if load_duration is not None:
+            is_cold = load_duration > COLD_LOAD_THRESHOLD_NS
+        else:
+            # Servers that don't report load time: the first call per model is cold
+            is_cold = model not in self.warmed_models
+        (self.cold if is_cold else self.warm).record(latency)
+        self.warmed_models.add(model)
+
+    async def generate(self, model: str, prompt: str, system: Optional[str] = None,
+                       options: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Run a non-streaming generation and return the raw Ollama response
+
+        Connection errors, timeouts and 5xx responses fail over to the next
+        endpoint; OllamaUnavailable is raised when every endpoint has failed.
+        """
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": False,
+            "keep_alive": self.keep_alive,
+        }
+        if system:
+            payload["system"] = system
+        if options:
+            payload["options"] = options
+
+        started = time.perf_counter()
+        result = await self._post(lambda endpoint: endpoint.generate_url, payload)
+        if result is not None:
+            self._record(model, time.perf_counter() - started, result)
+        return result
+
+    async def embed(self, model: str, inputs: List[str]) -> List[List[float]]:
+        """Embedding vectors for a batch of texts from /api/embed
+
+        Fails over like generate(); raises OllamaUnavailable when no endpoint
+        could serve the request and ValueError on an unusable response.
+        """
+        payload = {"model": model, "input": inputs, "keep_alive": self.keep_alive}
+        result = await self._post(lambda endpoint: endpoint.embed_url, payload)
+        embeddings = (result or {}).get("embeddings")
+        if not embeddings or len(embeddings) != len(inputs):
+            raise ValueError(f"Ollama returned no embeddings from {model}")
+        return embeddings
+
+    async def _post(self, url_of, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """POST to the least loaded endpoint, failing over on errors and 5xx"""
+        session = await self._get_session()
+        tried: List[OllamaEndpoint] = []
+        last_error: Optional[Exception] = None
+
+        while True:
+            endpoint = self._pick_endpoint(tried)
+            if endpoint is None:
+                break
+            tried.append(endpoint)
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            try:
+                async with session.post(url_of(endpoint), json=payload) as response:
+                    if response.status >= 500:
+                        raise aiohttp.ClientResponseError(
+                            response.request_info, response.history, status=response.status
+                        )
+                    if response.status != 200:
+                        endpoint.breaker.record_success()
+                        logger.error(f"Ollama request to {endpoint.base_url} failed: {response.status}")
+                        return None
+                    result = await response.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                # ValueError: a body that isn't valid JSON
+                endpoint.failures += 1
+                endpoint.breaker.record_failure()
+                last_error = e
+                logger.warning(f"Ollama endpoint {endpoint.base_url} failed: {e!r}")
+                continue
+            except BaseException:
+                # Cancelled or unexpected: free the endpoint's half-open probe slot
+                endpoint.breaker.release_probe()
+                raise
+            finally:
+                endpoint.outstanding -= 1
+
+            endpoint.breaker.record_success()
+            return result
+
+        raise OllamaUnavailable(
+            f"No Ollama endpoint available (last error: {last_error!r})",
+            timed_out=isinstance(last_error, asyncio.TimeoutError),
+        )
+
+    async def warm_up(self, model: str) -> bool:
+        """Load a model on every endpoint and pin it before the first real request"""
+        session = await self._get_session()
+        warmed = False
+        for endpoint in self.endpoints:
+            try:
+                # A generate request without a prompt only loads the model
+                started = time.perf_counter()
+                payload = {"model": model, "keep_alive": self.keep_alive}
+                async with session.post(endpoint.generate_url, json=payload) as response:
+                    if response.status != 200:
+                        logger.warning(f"Warm-up of {model} on {endpoint.base_url} failed: {response.status}")
+                        continue
+                    await response.read()
+                warmed = True
+                logger.info(f"Warmed {model} on {endpoint.base_url} in {time.perf_counter() - started:.2f}s")
+            except Exception as e:
+                logger.warning(f"Warm-up of {model} on {endpoint.base_url} failed: {e}")
+        if warmed:
+            self.warmed_models.add(model)
+        return warmed
+
+    async def probe(self, endpoint: OllamaEndpoint) -> bool:
+        """Check an endpoint against /api/tags and update its health"""
+        session = await self._get_session()
+        try:
+            async with session.get(endpoint.tags_url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                healthy = response.status == 200
+        except Exception:
+            healthy = False
+        if healthy and not endpoint.healthy:
+            logger.info(f"Ollama endpoint {endpoint.base_url} is back")
+            endpoint.breaker.record_success()
+        elif not healthy and endpoint.healthy:
+            logger.warning(f"Ollama endpoint {endpoint.base_url} failed health check")
+        endpoint.healthy = healthy
+        return healthy
+
+    async def check_health(self) -> List[Dict[str, Any]]:
+        """Probe all endpoints now and return their status"""
+        await asyncio.gather(*(self.probe(endpoint) for endpoint in self.endpoints))
+        return [endpoint.to_dict() for endpoint in self.endpoints]
+
+    def is_available(self) -> bool:
+        return any(endpoint.is_available() for endpoint in self.endpoints)
+
+    async def _health_loop(self):
+        while True:
+            await self.check_health()
+            await asyncio.sleep(self.health_interval)
+
+    def start_health_checks(self):
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def close(self):
+        if self._health_task is not None:
+            self._health_task.cancel()
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "keep_alive": self.keep_alive,
+            "warmed_models": sorted(self.warmed_models),
+            "cold": self.cold.to_dict(),
+            "warm": self.warm.to_dict(),
+            "endpoints": [endpoint.to_dict() for endpoint in self.endpoints],
+        }
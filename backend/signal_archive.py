@@ -0,0 +1,246 @@
+"""
+Columnar signal history
+Appends each cycle's signals to date-partitioned Parquet files
+(data/signals/date=YYYY-MM-DD/part-*.parquet) with dictionary-encoded
+categorical columns, and streams them back out as Arrow IPC or Parquet.
+"""
+
+import os
+import time
+import glob
+import threading
+import logging
+from datetime import datetime, date
+from typing import List, Dict, Any, Optional, Iterator, BinaryIO
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_DIR = os.getenv(
+    "SIGNAL_ARCHIVE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "signals"),
+)
+
+# Small per-cycle files in one partition are merged once there are this many
+MAX_PARTS_PER_PARTITION = 48
+
+CATEGORICAL = pa.dictionary(pa.int32(), pa.string())
+
+SCHEMA = pa.schema([
+    ("timestamp", pa.timestamp("us")),
+    ("stock", CATEGORICAL),
+    ("event", CATEGORICAL),
+    ("sentiment", CATEGORICAL),
+    ("signal", CATEGORICAL),
+    ("confidence", pa.int16()),
+    ("reason", pa.string()),
+    ("headline", pa.string()),
+    ("source", CATEGORICAL),
+    ("model", CATEGORICAL),
+])
+
+CATEGORICAL_COLUMNS = ["stock", "event", "sentiment", "signal", "source", "model"]
+
+
+def _parse_timestamp(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return datetime.now()
+
+
+def _parse_confidence(value: Any) -> Optional[int]:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def signals_to_table(signals: List[Dict[str, Any]]) -> pa.Table:
+    """Build an Arrow table in the archive schema from signal dicts"""
+    columns = {
+        "timestamp": [_parse_timestamp(s.get("timestamp")) for s in signals],
+        "confidence": [_parse_confidence(s.get("confidence")) for s in signals],
+        "reason": [s.get("reason") for s in signals],
+        "headline": [s.get("headline") for s in signals],
+    }
+    for name in CATEGORICAL_COLUMNS:
+        values = [s.get(name) for s in signals]
+        columns[name] = [str(v) if v is not None else None for v in values]
+
+    arrays = []
+    for field in SCHEMA:
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(columns[field.name], type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(columns[field.name], type=field.type))
+    return pa.Table.from_arrays(arrays, schema=SCHEMA)
+
+
+def read_parts(parts: List[Any]) -> pa.Table:
+    """Part files (paths or open files) as a single table"""
+    if not parts:
+        return SCHEMA.empty_table()
+    return pa.concat_tables([pq.read_table(p, schema=SCHEMA) for p in parts]).unify_dictionaries()
+
+
+class SignalArchive:
+    """Date-partitioned Parquet store for signal history"""
+
+    def __init__(self, root: str = DEFAULT_ARCHIVE_DIR):
+        self.root = os.path.abspath(root)
+        self.rows_written = 0
+        self.files_written = 0
+        # Held while partition files are written or replaced (appends, compaction, retention)
+        self.lock = threading.Lock()
+
+    def partition_dir(self, day: date) -> str:
+        return os.path.join(self.root, f"date={day.isoformat()}")
+
+    def partitions(self, start: Optional[date] = None, end: Optional[date] = None) -> List[str]:
+        """Partition directories in date order, optionally within [start, end]"""
+        result = []
+        for path in sorted(glob.glob(os.path.join(self.root, "date=*"))):
+            try:
+                day = date.fromisoformat(os.path.basename(path)[len("date="):])
+            except ValueError:
+                continue
+            if (start and day < start) or (end and day > end):
+                continue
+            result.append(path)
+        return result
+
+    def append(self, signals: List[Dict[str, Any]]) -> int:
+        """Write signals as new part files, one per day they fall on"""
+        if not signals:
+            return 0
+        with self.lock:
+            return self._append(signals)
+
+    def _append(self, signals: List[Dict[str, Any]]) -> int:
+        table = signals_to_table(signals)
+        days = pc.strftime(table["timestamp"], format="%Y-%m-%d")
+        written = 0
+        for day in sorted(pc.unique(days).to_pylist()):
+            part = table.filter(pc.equal(days, day))
+            directory = self.partition_dir(date.fromisoformat(day))
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"part-{time.time_ns()}.parquet")
+            tmp_path = f"{path}.tmp"
+            pq.write_table(part, tmp_path, compression="zstd")
+            os.replace(tmp_path, path)
+            written += part.num_rows
+            self.files_written += 1
+            if len(glob.glob(os.path.join(directory, "part-*.parquet"))) > MAX_PARTS_PER_PARTITION:
+                self.compact_partition(directory)
+        self.rows_written += written
+        return written
+
+    def read_partition(self, directory: str) -> pa.Table:
+        """All rows of one partition as a single table"""
+        parts = sorted(glob.glob(os.path.join(directory, "part-*.parquet")))
+        return read_parts(parts)
+
+    def open_parts(self, directory: str) -> List[BinaryIO]:
+        """Open a partition's current part files; the caller closes them
+
+        Call with `lock` held. The open files stay readable after the lock
+        is released, even if compaction or retention then deletes them, so
+        a long read sees one consistent version of the partition.
+        """
+        return [open(part, "rb") for part in sorted(glob.glob(os.path.join(directory, "part-*.parquet")))]
+
+    def compact_partition(self, directory: str):
+        """Merge a partition's part files into one"""
+        parts = sorted(glob.glob(os.path.join(directory, "part-*.parquet")))
+        if len(parts) < 2:
+            return
+        table = self.read_partition(directory)
+        path = os.path.join(directory, f"part-{time.time_ns()}.parquet")
+        tmp_path = f"{path}.tmp"
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+        for part in parts:
+            os.remove(part)
+        logger.info(f"Compacted {len(parts)} files in {directory}")
+
+    def iter_batches(self, start: Optional[date] = None, end: Optional[date] = None) -> Iterator[pa.RecordBatch]:
+        """Record batches for the requested date range, one partition file at a time
+
+        A partition compacted or rolled up while the stream runs is read as
+        it was when the stream reached it; one already gone is skipped.
+        """
+        for directory in self.partitions(start, end):
+            with self.lock:
+                handles = self.open_parts(directory)
+            try:
+                for handle in handles:
+                    # Each file carries its own dictionaries; the IPC stream sends
+                    # replacements as needed and Parquet re-encodes per row group
+                    yield from pq.ParquetFile(handle).iter_batches(batch_size=65536)
+            finally:
+                for handle in handles:
+                    handle.close()
+
+    def stream_arrow(self, start: Optional[date] = None, end: Optional[date] = None) -> Iterator[bytes]:
+        """Arrow IPC stream bytes, emitted batch by batch"""
+        sink = _ChunkSink()
+        with pa.ipc.new_stream(sink, SCHEMA) as writer:
+            for batch in self.iter_batches(start, end):
+                writer.write_batch(batch)
+                yield sink.drain()
+        yield sink.drain()
+
+    def stream_parquet(self, start: Optional[date] = None, end: Optional[date] = None) -> Iterator[bytes]:
+        """A single Parquet file covering the range, emitted row group by row group"""
+        sink = _ChunkSink()
+        with pq.ParquetWriter(sink, SCHEMA, compression="zstd") as writer:
+            for batch in self.iter_batches(start, end):
+                writer.write_batch(batch)
+                yield sink.drain()
+        yield sink.drain()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "root": self.root,
+            "partitions": len(self.partitions()),
+            "rows_written": self.rows_written,
+            "files_written": self.files_written,
+        }
+
+
+class _ChunkSink:
+    """Write-only file object that hands accumulated bytes to a generator"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
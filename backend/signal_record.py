@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory signal representation
+Signals are kept as __slots__ records with interned categorical fields,
+epoch-microsecond timestamps and headlines/reasons shared through a string
+table, and only turned back into dicts when serialized.
+
+Run this module directly to compare bytes per signal against plain dicts.
+"""
+
+import sys
+import time
+import asyncio
+import hashlib
+from collections import deque
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
+
+CATEGORICAL_FIELDS = ("stock", "event", "sentiment", "signal", "source", "model")
+KNOWN_FIELDS = CATEGORICAL_FIELDS + ("id", "confidence", "reason", "headline", "timestamp")
+
+# Versions of change history kept for delta sync; older clients get a full snapshot
+CHANGE_LOG_SIZE = 256
+
+
+def _to_epoch_us(value: Any) -> int:
+    if isinstance(value, datetime):
+        moment = value
+    else:
+        try:
+            moment = datetime.fromisoformat(str(value))
+        except ValueError:
+            moment = datetime.now()
+    return int(moment.timestamp()) * 1_000_000 + moment.microsecond
+
+
+def _from_epoch_us(value: int) -> datetime:
+    return datetime.fromtimestamp(value // 1_000_000).replace(microsecond=value % 1_000_000)
+
+
+def signal_id(headline: Optional[str]) -> str:
+    """Stable id for the signal derived from a headline"""
+    return hashlib.sha1((headline or "").encode("utf-8")).hexdigest()[:12]
+
+
+def _intern(value: Any) -> Optional[str]:
+    return sys.intern(str(value)) if value is not None else None
+
+
+class StringTable:
+    """Deduplicates long strings (headlines, reasons) shared across records"""
+
+    def __init__(self):
+        self._strings: Dict[str, str] = {}
+
+    def add(self, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        return self._strings.setdefault(value, value)
+
+    def retain(self, live: Iterable[str]):
+        """Drop strings no longer referenced by any record"""
+        self._strings = {s: s for s in live if s is not None}
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+
+class SignalRecord:
+    """One analyzed headline"""
+
+    __slots__ = ("id", "stock", "event", "sentiment", "signal", "confidence", "reason",
+                 "headline", "timestamp_us", "source", "model", "extra")
+
+    def __init__(self, stock: Optional[str], event: Optional[str], sentiment: Optional[str],
+                 signal: Optional[str], confidence: Any, reason: Optional[str], headline: Optional[str],
+                 timestamp_us: int, source: Optional[str] = None, model: Optional[str] = None,
+                 extra: Optional[Dict[str, Any]] = None):
+        self.id = signal_id(headline)
+        self.stock = stock
+        self.event = event
+        self.sentiment = sentiment
+        self.signal = signal
+        self.confidence = confidence
+        self.reason = reason
+        self.headline = headline
+        self.timestamp_us = timestamp_us
+        self.source = source
+        self.model = model
+        # Fields a model returned beyond the standard set; usually None
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], strings: Optional[StringTable] = None) -> "SignalRecord":
+        if strings is None:
+            strings = StringTable()
+        extra = {k: v for k, v in data.items() if k not in KNOWN_FIELDS} or None
+        return cls(
+            stock=_intern(data.get("stock")),
+            event=_intern(data.get("event")),
+            sentiment=_intern(data.get("sentiment")),
+            signal=_intern(data.get("signal")),
+            confidence=data.get("confidence"),
+            reason=strings.add(data.get("reason")),
+            headline=strings.add(data.get("headline")),
+            timestamp_us=_to_epoch_us(data.get("timestamp")),
+            source=_intern(data.get("source")),
+            model=_intern(data.get("model")),
+            extra=extra,
+        )
+
+    @property
+    def timestamp(self) -> datetime:
+        return _from_epoch_us(self.timestamp_us)
+
+    def same_analysis(self, other: "SignalRecord") -> bool:
+        """True if both records carry the same call, ignoring when it was made"""
+        return (self.stock == other.stock and self.event == other.event and self.sentiment == other.sentiment
+                and self.signal == other.signal and self.confidence == other.confidence
+                and self.reason == other.reason and self.extra == other.extra)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Same shape as the dicts produced by the analysis pipeline, plus id"""
+        data = {
+            "id": self.id,
+            "stock": self.stock,
+            "event": self.event,
+            "sentiment": self.sentiment,
+            "signal": self.signal,
+            "confidence": self.confidence,
+            "reason": self.reason,
+            "headline": self.headline,
+            "timestamp": self.timestamp.isoformat(),
+        }
+        if self.source is not None:
+            data["source"] = self.source
+        if self.model is not None:
+            data["model"] = self.model
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+class SignalStore:
+    """Current signal snapshot held as compact records
+
+    Every replace() that changes the snapshot bumps a monotonically
+    increasing version and logs which ids were added or removed, so clients
+    can ask for just the changes since the version they already have.
+    Versions start at the wall clock in milliseconds, so a version held
+    from before a restart is never mistaken for one of this process's
+    and the client gets a full snapshot.
+    """
+
+    def __init__(self, change_log_size: int = CHANGE_LOG_SIZE):
+        self.strings = StringTable()
+        self.records: List[SignalRecord] = []
+        self.version = time.time_ns() // 1_000_000
+        # (version, upserted ids, removed ids) for recent versions
+        self.changes: deque = deque(maxlen=change_log_size)
+        self._changed: Optional[asyncio.Condition] = None
+
+    def replace(self, signals: List[Dict[str, Any]]) -> List[SignalRecord]:
+        """Swap in a new snapshot and return the records that are new or changed"""
+        previous = {record.id: record for record in self.records}
+        records = []
+        upserted: List[SignalRecord] = []
+        for data in signals:
+            record = SignalRecord.from_dict(data, self.strings)
+            old = previous.get(record.id)
+            if old is not None and old.same_analysis(record):
+                # Unchanged call: keep the existing record and its first-seen time
+                record = old
+            else:
+                upserted.append(record)
+            records.append(record)
+        current_ids = {record.id for record in records}
+        removed = [record_id for record_id in previous if record_id not in current_ids]
+
+        self.records = records
+        live = [r.headline for r in self.records] + [r.reason for r in self.records]
+        self.strings.retain(live)
+
+        if upserted or removed:
+            self.version += 1
+            self.changes.append((self.version, {record.id for record in upserted}, set(removed)))
+            self._notify()
+        return upserted
+
+    def changes_since(self, since: int) -> Tuple[bool, List[Dict[str, Any]], List[str]]:
+        """(reset, upserted signals, removed ids) needed to bring `since` up to date
+
+        reset means the client is too far behind (or new) and gets the full
+        snapshot as upserts.
+        """
+        oldest = self.changes[0][0] if self.changes else self.version + 1
+        if since <= 0 or since < oldest - 1 or since > self.version:
+            return True, self.to_dicts(), []
+        upserted, removed = set(), set()
+        for version, added_ids, removed_ids in self.changes:
+            if version > since:
+                upserted |= added_ids
+                removed |= removed_ids
+        current_ids = {record.id for record in self.records}
+        added = [record.to_dict() for record in self.records if record.id in upserted]
+        return False, added, sorted((removed | upserted) - current_ids)
+
+    def _notify(self):
+        if self._changed is None:
+            return
+        changed = self._changed
+
+        async def wake():
+            async with changed:
+                changed.notify_all()
+        try:
+            asyncio.get_running_loop().create_task(wake())
+        except RuntimeError:
+            pass
+
+    async def wait_for_change(self, since: int, timeout: float) -> bool:
+        """Wait until the version moves past `since`; False on timeout"""
+        if self.version != since:
+            return True
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        try:
+            async with self._changed:
+                await asyncio.wait_for(self._changed.wait_for(lambda: self.version != since), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [record.to_dict() for record in self.records]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[SignalRecord]:
+        return iter(self.records)
+
+
+def deep_sizeof(obj: Any, seen: Optional[set] = None) -> int:
+    """Bytes held by obj and everything it references, counting shared objects once"""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, slot), seen) for slot in obj.__slots__ if hasattr(obj, slot))
+    return size
+
+
+def _benchmark(count: int = 10000):
+    import json
+    from keyword_analyzer import IntelligentAnalyzer
+    from headline_generator import HeadlineGenerator
+
+    analyzer = IntelligentAnalyzer()
+    # Every headline in a real snapshot is distinct (records are keyed by its
+    # hash), so the string table gets no help from repeated headlines
+    generator = HeadlineGenerator(duplicate_rate=0, paraphrase_rate=0)
+    headlines = set()
+    signals = []
+    while len(signals) < count:
+        generated = generator.next()
+        if generated.title in headlines:
+            continue
+        headlines.add(generated.title)
+        signal = analyzer.analyze_headline(generated.title)
+        # Model reasons are free text and rarely repeat
+        signal.update(headline=generated.title, reason=f"{signal['reason']} at {generated.company}",
+                      timestamp=generated.published.isoformat(), source="ollama")
+        # Decode through JSON like signals coming back from Ollama, so equal
+        # strings are separate objects as they would be in production
+        signals.append(json.loads(json.dumps(signal)))
+
+    dict_bytes = deep_sizeof(signals)
+    store = SignalStore()
+    store.replace(signals)
+    seen = set()
+    record_bytes = deep_sizeof(store.records, seen) + deep_sizeof(store.strings._strings, seen)
+    print(f"{count} signals")
+    print(f"  dicts:   {dict_bytes / count:8.1f} bytes/signal")
+    print(f"  records: {record_bytes / count:8.1f} bytes/signal ({dict_bytes / record_bytes:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,309 @@
+"""
+Signal history retention with rollups
+Raw per-headline signals stay in the archive for a configurable window.
+Older days are compacted one partition at a time into per-stock hourly
+rollups (one file per day) and daily rollups (one file per month), after
+which the raw partition is removed. History queries read raw partitions
+for the recent window and rollups before it, so they stay fast as history
+grows to years.
+"""
+
+import os
+import glob
+import shutil
+import logging
+from datetime import date, timedelta
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from signal_archive import SignalArchive, read_parts
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROLLUP_DIR = os.getenv(
+    "SIGNAL_ROLLUP_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "signal_rollups"),
+)
+
+# Days of raw per-headline signals kept (0 keeps them forever)
+RAW_RETENTION_DAYS = int(os.getenv("SIGNAL_RAW_RETENTION_DAYS", "90"))
+
+# Days of hourly rollups kept; daily rollups are kept forever
+HOURLY_RETENTION_DAYS = int(os.getenv("SIGNAL_HOURLY_RETENTION_DAYS", "365"))
+
+# Seconds between background retention passes
+RETENTION_INTERVAL = float(os.getenv("SIGNAL_RETENTION_INTERVAL", "3600"))
+
+HOUR, DAY = "hour", "day"
+
+SIGNAL_VALUES = ["buy", "sell", "hold"]
+SENTIMENTS = ["positive", "negative", "neutral"]
+
+# Sums, so rollups can be merged into coarser buckets and across days
+COUNT_COLUMNS = ["signals", *SIGNAL_VALUES, *SENTIMENTS, "confidence_sum", "confidence_count"]
+
+ROLLUP_SCHEMA = pa.schema(
+    [("bucket", pa.timestamp("us")), ("stock", pa.string())]
+    + [(name, pa.int64()) for name in COUNT_COLUMNS]
+)
+
+
+def _day_of(path: str, prefix: str) -> date:
+    return date.fromisoformat(os.path.basename(path)[len(prefix):].split(".")[0])
+
+
+def _months(start: date, end: date) -> Iterator[date]:
+    month = start.replace(day=1)
+    while month <= end:
+        yield month
+        month = (month + timedelta(days=32)).replace(day=1)
+
+
+def _sum_by_bucket(table: pa.Table) -> pa.Table:
+    grouped = table.group_by(["bucket", "stock"]).aggregate([(name, "sum") for name in COUNT_COLUMNS])
+    renamed = {f"{name}_sum": name for name in COUNT_COLUMNS}
+    grouped = grouped.rename_columns([renamed.get(name, name) for name in grouped.column_names])
+    return grouped.select(ROLLUP_SCHEMA.names).cast(ROLLUP_SCHEMA)
+
+
+def _latest_per_signal(table: pa.Table) -> pa.Table:
+    """Last row of each signal (keyed by headline, like signal ids) in a day's rows
+
+    A headline analyzed again the same day, e.g. a keyword fallback redone
+    by a model, counts once with its latest call.
+    """
+    latest: Dict[str, int] = {}
+    keep = []
+    for index, headline in enumerate(table["headline"].to_pylist()):
+        if headline is None:
+            keep.append(index)
+        else:
+            latest[headline] = index
+    keep.extend(latest.values())
+    return table.take(sorted(keep))
+
+
+def rollup_table(table: pa.Table, grain: str) -> pa.Table:
+    """Per-stock counts of one raw day's signals for each hour or day; a signal counts once"""
+    if table.num_rows == 0:
+        return ROLLUP_SCHEMA.empty_table()
+    table = _latest_per_signal(table)
+    signal = pc.utf8_lower(pc.cast(table["signal"], pa.string()))
+    sentiment = pc.utf8_lower(pc.cast(table["sentiment"], pa.string()))
+    confidence = table["confidence"]
+    columns = {
+        "bucket": pc.floor_temporal(table["timestamp"], unit=grain),
+        "stock": pc.fill_null(pc.cast(table["stock"], pa.string()), ""),
+        "signals": pa.array([1] * table.num_rows, type=pa.int64()),
+    }
+    for value in SIGNAL_VALUES:
+        columns[value] = pc.cast(pc.fill_null(pc.equal(signal, value), False), pa.int64())
+    for value in SENTIMENTS:
+        columns[value] = pc.cast(pc.fill_null(pc.equal(sentiment, value), False), pa.int64())
+    columns["confidence_sum"] = pc.cast(pc.fill_null(confidence, 0), pa.int64())
+    columns["confidence_count"] = pc.cast(pc.is_valid(confidence), pa.int64())
+    return _sum_by_bucket(pa.table(columns))
+
+
+def merge_rollups(tables: List[pa.Table], grain: str) -> pa.Table:
+    """Combine rollups, re-bucketing them to grain (hourly into daily, or overlapping days)"""
+    tables = [t for t in tables if t.num_rows]
+    if not tables:
+        return ROLLUP_SCHEMA.empty_table()
+    table = pa.concat_tables(tables)
+    table = table.set_column(0, "bucket", pc.floor_temporal(table["bucket"], unit=grain))
+    return _sum_by_bucket(table)
+
+
+def _write(table: pa.Table, path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    pq.write_table(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+
+
+def _read(path: str) -> pa.Table:
+    return pq.read_table(path, schema=ROLLUP_SCHEMA) if os.path.exists(path) else ROLLUP_SCHEMA.empty_table()
+
+
+class SignalRetention:
+    """Compacts expired raw archive days into rollups and answers history queries"""
+
+    def __init__(self, archive: SignalArchive, root: str = DEFAULT_ROLLUP_DIR,
+                 raw_days: int = RAW_RETENTION_DAYS, hourly_days: int = HOURLY_RETENTION_DAYS):
+        self.archive = archive
+        self.root = os.path.abspath(root)
+        self.raw_days = raw_days
+        # Hourly files are the source for their month's daily file, so they
+        # must outlive the raw window by at least a month
+        self.hourly_days = max(hourly_days, raw_days + 31)
+        # Hourly rollups of raw days, keyed by day and reused while its part files are unchanged
+        self._raw_rollups: Dict[date, Any] = {}
+        self.compacted_days = 0
+        self.compacted_rows = 0
+        self.pruned_hourly = 0
+
+    def hourly_path(self, day: date) -> str:
+        return os.path.join(self.root, HOUR, f"date={day.isoformat()}.parquet")
+
+    def daily_path(self, day: date) -> str:
+        return os.path.join(self.root, DAY, f"month={day.strftime('%Y-%m')}.parquet")
+
+    def hourly_days_on_disk(self) -> List[date]:
+        return sorted(_day_of(p, "date=") for p in glob.glob(os.path.join(self.root, HOUR, "date=*.parquet")))
+
+    def raw_days_on_disk(self) -> List[date]:
+        return [_day_of(p, "date=") for p in self.archive.partitions()]
+
+    def _raw_parts(self, day: date) -> Tuple[str, ...]:
+        directory = self.archive.partition_dir(day)
+        return tuple(sorted(os.listdir(directory))) if os.path.isdir(directory) else ()
+
+    def expired_partitions(self, today: Optional[date] = None) -> List[str]:
+        """Raw partitions older than the retention window, oldest first"""
+        if self.raw_days <= 0:
+            return []
+        cutoff = (today or date.today()) - timedelta(days=self.raw_days)
+        return self.archive.partitions(end=cutoff - timedelta(days=1))
+
+    def compact_step(self, today: Optional[date] = None) -> bool:
+        """Compact the oldest expired raw day, or prune one old hourly file
+
+        Does one partition's worth of work so the caller can yield between
+        steps; returns False once there is nothing left to do.
+        """
+        expired = self.expired_partitions(today)
+        if expired:
+            self.compact_partition(expired[0])
+            return True
+        hourly_cutoff = (today or date.today()) - timedelta(days=self.hourly_days)
+        for day in self.hourly_days_on_disk():
+            if day >= hourly_cutoff:
+                break
+            if os.path.exists(self.daily_path(day)):
+                with self.archive.lock:
+                    os.remove(self.hourly_path(day))
+                self.pruned_hourly += 1
+                return True
+        return False
+
+    def compact_partition(self, directory: str):
+        """Roll up one raw day, fold it into its month's daily file, then drop the raw files
+
+        Every write replaces a whole file computed from its sources, so a
+        crash part way through is repaired by running the step again.
+        """
+        day = _day_of(directory, "date=")
+        with self.archive.lock:
+            raw = self.archive.read_partition(directory)
+            hourly = rollup_table(raw, HOUR)
+            _write(hourly, self.hourly_path(day))
+            self._rebuild_month(day)
+            shutil.rmtree(directory)
+            self._raw_rollups.pop(day, None)
+        self.compacted_days += 1
+        self.compacted_rows += raw.num_rows
+        logger.info(f"Compacted {raw.num_rows} raw signals from {day} into {hourly.num_rows} hourly rollups")
+
+    def _rebuild_month(self, day: date):
+        """Daily rollups for a month: from hourly files where they exist, kept rows otherwise"""
+        month = day.replace(day=1)
+        hourly_days = {d for d in self.hourly_days_on_disk() if d.replace(day=1) == month}
+        existing = _read(self.daily_path(day))
+        kept_mask = [d.date() not in hourly_days for d in existing["bucket"].to_pylist()]
+        kept = existing.filter(pa.array(kept_mask, type=pa.bool_())) if existing.num_rows else existing
+        daily = merge_rollups([kept] + [_read(self.hourly_path(d)) for d in sorted(hourly_days)], DAY)
+        _write(daily, self.daily_path(day))
+
+    def query(self, start: date, end: date, grain: str = DAY, stock: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Per-stock buckets between start and end (inclusive)
+
+        Days still in the raw archive are rolled up on the fly; older days
+        come from rollup files. Hourly buckets are only available while the
+        hourly rollups are kept.
+        """
+        # Compaction moves a day from raw files to rollups under this lock, so
+        # which files to read is decided under it; they are read after it is
+        # released, through files opened while it was held
+        with self.archive.lock:
+            snapshot = self._snapshot(start, end, grain)
+        try:
+            result = merge_rollups(self._collect(snapshot, start, end), grain)
+        finally:
+            for handle in snapshot["handles"]:
+                handle.close()
+        if stock:
+            result = result.filter(pc.equal(pc.utf8_lower(result["stock"]), stock.lower()))
+        rows = []
+        for row in result.sort_by([("bucket", "ascending"), ("stock", "ascending")]).to_pylist():
+            count = row.pop("confidence_count")
+            total = row.pop("confidence_sum")
+            row["bucket"] = row["bucket"].isoformat()
+            row["mean_confidence"] = round(total / count, 1) if count else None
+            rows.append(row)
+        return rows
+
+    def _snapshot(self, start: date, end: date, grain: str) -> Dict[str, Any]:
+        """Raw days and rollup files covering the range, opened; call with the archive lock held
+
+        Raw days whose rollup is cached for the same part files are not opened.
+        """
+        # day -> (part names, opened parts, or the cached rollup if they are unchanged)
+        raw: Dict[date, Tuple[Tuple[str, ...], Optional[list], Optional[pa.Table]]] = {}
+        handles = []
+        for day in self.raw_days_on_disk():
+            if not start <= day <= end:
+                continue
+            parts = self._raw_parts(day)
+            cached = self._raw_rollups.get(day)
+            if cached is not None and cached[0] == parts:
+                raw[day] = (parts, None, cached[1])
+                continue
+            opened = self.archive.open_parts(self.archive.partition_dir(day))
+            handles.extend(opened)
+            raw[day] = (parts, opened, None)
+
+        if grain == HOUR:
+            paths = [self.hourly_path(d) for d in self.hourly_days_on_disk() if start <= d <= end and d not in raw]
+        else:
+            paths = [self.daily_path(month) for month in _months(start, end)]
+        rollups = [open(path, "rb") for path in paths if os.path.exists(path)]
+        handles.extend(rollups)
+        return {"raw": raw, "rollups": rollups, "handles": handles}
+
+    def _collect(self, snapshot: Dict[str, Any], start: date, end: date) -> List[pa.Table]:
+        raw_days = snapshot["raw"]
+        tables = []
+        for day in sorted(raw_days):
+            parts, opened, table = raw_days[day]
+            if opened is None:
+                tables.append(table)
+                continue
+            table = rollup_table(read_parts(opened), HOUR)
+            self._raw_rollups[day] = (parts, table)
+            tables.append(table)
+
+        for handle in snapshot["rollups"]:
+            table = pq.read_table(handle, schema=ROLLUP_SCHEMA)
+            if not table.num_rows:
+                continue
+            # Days that are also still raw were counted above
+            days = [b.date() for b in table["bucket"].to_pylist()]
+            mask = [start <= d <= end and d not in raw_days for d in days]
+            tables.append(table.filter(pa.array(mask, type=pa.bool_())))
+        return tables
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "root": self.root,
+            "raw_retention_days": self.raw_days,
+            "hourly_retention_days": self.hourly_days,
+            "hourly_files": len(self.hourly_days_on_disk()),
+            "daily_files": len(glob.glob(os.path.join(self.root, DAY, "month=*.parquet"))),
+            "compacted_days": self.compacted_days,
+            "compacted_rows": self.compacted_rows,
+            "pruned_hourly_files": self.pruned_hourly,
+        }
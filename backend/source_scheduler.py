@@ -0,0 +1,131 @@
+"""
+Per-source yield tracking and adaptive polling
+Each news source keeps its own poll interval. Sources that keep publishing
+new headlines that turn into signals are polled more often; quiet, failing
+or low-yield sources are backed off, so fetch and LLM budget follow the
+sources that actually produce signals.
+"""
+
+import os
+import time
+import logging
+from typing import List, Dict, Any, Optional, Iterable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_INTERVAL = float(os.getenv("SOURCE_MIN_INTERVAL", "60"))
+DEFAULT_MAX_INTERVAL = float(os.getenv("SOURCE_MAX_INTERVAL", "1800"))
+
+# Share of analyzed headlines that must become signals before a source may speed up
+LOW_YIELD_RATE = 0.2
+
+# Weight of the latest poll in the smoothed per-source figures
+SMOOTHING = 0.2
+
+
+class SourceStats:
+    """Poll schedule and yield counters for one source"""
+
+    def __init__(self, name: str, interval: float):
+        self.name = name
+        self.interval = interval
+        self.next_due = 0.0
+        self.polls = 0
+        self.failures = 0
+        self.new_items = 0
+        self.analyzed = 0
+        self.signals = 0
+        self.llm_seconds = 0.0
+        self.new_per_poll: Optional[float] = None
+        self.hit_rate: Optional[float] = None
+
+    def record_analysis(self, seconds: float, is_signal: bool):
+        self.analyzed += 1
+        self.llm_seconds += seconds
+        if is_signal:
+            self.signals += 1
+        hit = 1.0 if is_signal else 0.0
+        self.hit_rate = hit if self.hit_rate is None else (1 - SMOOTHING) * self.hit_rate + SMOOTHING * hit
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "interval": round(self.interval, 1),
+            "due_in": round(max(0.0, self.next_due - time.monotonic()), 1),
+            "polls": self.polls,
+            "failures": self.failures,
+            "new_items": self.new_items,
+            "new_per_poll": round(self.new_per_poll, 2) if self.new_per_poll is not None else None,
+            "analyzed": self.analyzed,
+            "signals": self.signals,
+            "hit_rate": round(self.hit_rate, 3) if self.hit_rate is not None else None,
+            "signals_per_llm_second": round(self.signals / self.llm_seconds, 3) if self.llm_seconds else None,
+        }
+
+
+class AdaptivePoller:
+    """Decides which sources are due and adapts each source's interval
+
+    After every poll the interval is multiplied by a factor:
+      - failed poll (fetch or parse error): x2
+      - nothing new: x1.5
+      - new items: 1 - turnover/2, where turnover is the share of the
+        returned items that are new, so a feed that rolled over completely
+        is polled twice as often and one with a single new item keeps pace
+      - low yield (hit rate under LOW_YIELD_RATE) never speeds up
+    """
+
+    def __init__(self, base_interval: float, min_interval: float = DEFAULT_MIN_INTERVAL,
+                 max_interval: float = DEFAULT_MAX_INTERVAL):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.sources: Dict[str, SourceStats] = {}
+
+    def source(self, name: str) -> SourceStats:
+        if name not in self.sources:
+            interval = min(self.max_interval, max(self.min_interval, self.base_interval))
+            self.sources[name] = SourceStats(name, interval)
+        return self.sources[name]
+
+    def due(self, names: Iterable[str]) -> List[str]:
+        now = time.monotonic()
+        return [name for name in names if self.source(name).next_due <= now]
+
+    def seconds_until_due(self) -> float:
+        """Time until the next source is due, or the base interval with no sources"""
+        if not self.sources:
+            return self.base_interval
+        return max(0.0, min(s.next_due for s in self.sources.values()) - time.monotonic())
+
+    def record_poll(self, name: str, items: Optional[list]):
+        """Update a source after a poll; items is None when the poll failed"""
+        stats = self.source(name)
+        stats.polls += 1
+        if items is None:
+            stats.failures += 1
+            factor = 2.0
+        else:
+            new_count = sum(1 for item in items if item.is_new)
+            stats.new_items += new_count
+            stats.new_per_poll = (new_count if stats.new_per_poll is None
+                                  else (1 - SMOOTHING) * stats.new_per_poll + SMOOTHING * new_count)
+            if new_count == 0:
+                factor = 1.5
+            else:
+                factor = 1.0 - 0.5 * new_count / len(items)
+                if stats.hit_rate is not None and stats.hit_rate < LOW_YIELD_RATE:
+                    factor = max(factor, 1.0)
+
+        previous = stats.interval
+        stats.interval = min(self.max_interval, max(self.min_interval, stats.interval * factor))
+        stats.next_due = time.monotonic() + stats.interval
+        if abs(stats.interval - previous) >= 1:
+            logger.info(f"Polling {name} every {stats.interval:.0f}s (was {previous:.0f}s)")
+
+    def record_analysis(self, name: Optional[str], seconds: float, is_signal: bool):
+        if name is not None:
+            self.source(name).record_analysis(seconds, is_signal)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [stats.to_dict() for stats in self.sources.values()]
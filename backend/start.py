@@ -1,10 +1,31 @@
 #!/usr/bin/env python3
+"""
+Backend launcher
+Starts the API in demo, production or simulator mode (see APP_MODE in main.py).
+"""
+
+import argparse
 import os
 import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from demo_main import app
-import uvicorn
+MODES = ["demo", "production", "simulator"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stock News Analyzer backend")
+    parser.add_argument("--mode", choices=MODES, default=os.getenv("APP_MODE", "demo"),
+                        help="demo: sample data, production: live news and Ollama, "
+                             "simulator: sample headlines through the Ollama API")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    # Read by main.py at import, so it has to be set before uvicorn loads the app
+    os.environ["APP_MODE"] = args.mode
+    import uvicorn
+    uvicorn.run("main:app", host=args.host, port=args.port)
+
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark
+Measures, per mode, how long `import main` takes in a fresh interpreter and
+which heavy dependencies it pulls in, and how long a launched server takes
+to answer /health.
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+MODES = ["demo", "simulator", "production"]
+HEAVY_MODULES = ["aiohttp", "bs4", "numpy", "pyarrow", "pandas"]
+
+IMPORT_PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def _env(mode: str) -> dict:
+    env = dict(os.environ, APP_MODE=mode)
+    # Only measure startup, not a first pipeline run
+    env["SIGNAL_REFRESH_INTERVAL"] = "0"
+    return env
+
+
+def measure_import(mode: str) -> dict:
+    output = subprocess.run([sys.executable, "-c", IMPORT_PROBE], cwd=BACKEND_DIR, env=_env(mode),
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_ready(mode: str, timeout: float = 60) -> float:
+    """Seconds from process spawn until /health returns 200"""
+    port = _free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "start.py", "--mode", mode, "--host", "127.0.0.1",
+                                "--port", str(port)], cwd=BACKEND_DIR, env=_env(mode),
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=5) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                pass
+            if process.poll() is not None:
+                raise RuntimeError(f"{mode} server exited with code {process.returncode}")
+            time.sleep(0.02)
+        raise TimeoutError(f"{mode} server not ready after {timeout}s")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure backend import time and time to first healthy response")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma separated modes to measure")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per mode; medians are reported")
+    parser.add_argument("--no-server", action="store_true", help="Only measure imports")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    # One throwaway import so .pyc files exist and every mode starts equally warm
+    measure_import("demo")
+
+    results = []
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        imports = [measure_import(mode) for _ in range(args.runs)]
+        result = {
+            "mode": mode,
+            "import_ms": round(statistics.median(r["seconds"] for r in imports) * 1000, 1),
+            "heavy_modules": imports[-1]["loaded"],
+        }
+        if not args.no_server:
+            result["ready_ms"] = round(statistics.median(measure_ready(mode) for _ in range(args.runs)) * 1000, 1)
+        results.append(result)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'mode':<12}{'import ms':>10}{'ready ms':>10}  heavy modules at import")
+        for r in results:
+            ready = f"{r['ready_ms']:>10.1f}" if "ready_ms" in r else f"{'-':>10}"
+            print(f"{r['mode']:<12}{r['import_ms']:>10.1f}{ready}  {', '.join(r['heavy_modules']) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+Embedding vector index for semantic search over signals
+Vectors are L2-normalized float32 rows searched with blocked matrix-vector
+products. With a directory configured, rows are appended to a raw file that
+is memory-mapped for search, and the signals they belong to are kept in a
+JSONL file alongside, so the index survives restarts without loading
+everything into RAM.
+"""
+
+import os
+import re
+import json
+import threading
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from signal_record import SignalRecord, StringTable, signal_id
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_DIR = os.getenv(
+    "VECTOR_INDEX_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "vectors"),
+)
+
+# Rows scored per matrix-vector product; keeps temporaries cache sized
+SEARCH_BLOCK_ROWS = 65536
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class VectorIndex:
+    """Append-only index of signal embeddings for one embedding model
+
+    root=None keeps everything in memory. Otherwise each model gets its own
+    subdirectory holding index.json (vector size), vectors.f32 (rows of
+    float32) and signals.jsonl (one signal per row).
+    """
+
+    def __init__(self, model: str, root: Optional[str] = DEFAULT_INDEX_DIR):
+        self.model = model
+        self.directory = os.path.join(os.path.abspath(root), re.sub(r"[^\w.-]", "_", model)) if root else None
+        self.dim: Optional[int] = None
+        self.strings = StringTable()
+        self.records: List[SignalRecord] = []
+        self.ids = set()
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        # Row capacity grows geometrically in memory-only mode
+        self._buffer: Optional[np.ndarray] = None
+        self._times = np.empty(0, dtype=np.int64)
+        self._lock = threading.Lock()
+        if self.directory:
+            self._load()
+
+    @property
+    def meta_path(self) -> str:
+        return os.path.join(self.directory, "index.json")
+
+    @property
+    def vectors_path(self) -> str:
+        return os.path.join(self.directory, "vectors.f32")
+
+    @property
+    def signals_path(self) -> str:
+        return os.path.join(self.directory, "signals.jsonl")
+
+    def _load(self):
+        if not all(os.path.exists(p) for p in (self.meta_path, self.signals_path, self.vectors_path)):
+            return
+        with open(self.meta_path) as f:
+            self.dim = json.load(f)["dim"]
+        with open(self.signals_path, encoding="utf-8") as f:
+            signals = []
+            for line in f:
+                try:
+                    signals.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A torn last line from a crash mid-append
+                    break
+        rows = min(len(signals), os.path.getsize(self.vectors_path) // (self.dim * 4))
+        # Drop rows written to one file but not the other
+        self._truncate(rows)
+        if rows == 0:
+            return
+        for data in signals[:rows]:
+            self._add_record(data)
+        self._times = np.array([r.timestamp_us // 1_000_000 for r in self.records], dtype=np.int64)
+        self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+        logger.info(f"Loaded {rows} {self.model} vectors from {self.directory}")
+
+    def _truncate(self, rows: int):
+        with open(self.vectors_path, "rb+") as f:
+            f.truncate(rows * self.dim * 4)
+        with open(self.signals_path, "rb+") as f:
+            offset = 0
+            for _ in range(rows):
+                line = f.readline()
+                offset += len(line)
+            f.truncate(offset)
+
+    def _add_record(self, data: Dict[str, Any]):
+        record = SignalRecord.from_dict(data, self.strings)
+        self.records.append(record)
+        self.ids.add(record.id)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def contains(self, signal: Dict[str, Any]) -> bool:
+        return signal_id(signal.get("headline")) in self.ids
+
+    def add(self, signals: List[Dict[str, Any]], embeddings: List[List[float]]) -> int:
+        """Append signals with their embeddings, skipping ones already indexed"""
+        rows, kept, keys = [], [], set()
+        for signal, embedding in zip(signals, embeddings):
+            key = signal_id(signal.get("headline"))
+            if key in self.ids or key in keys:
+                continue
+            keys.add(key)
+            rows.append(embedding)
+            kept.append(signal)
+        if not kept:
+            return 0
+        vectors = _normalize(np.asarray(rows, dtype=np.float32))
+
+        with self._lock:
+            if self.dim is not None and vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding size {vectors.shape[1]} does not match index size {self.dim}")
+            self.dim = vectors.shape[1]
+
+            count = len(self.records) + len(kept)
+            if self.directory:
+                if not os.path.exists(self.meta_path):
+                    os.makedirs(self.directory, exist_ok=True)
+                    with open(self.meta_path, "w") as f:
+                        json.dump({"model": self.model, "dim": self.dim}, f)
+                # Vectors first: on restart rows without a signal line are dropped
+                with open(self.vectors_path, "ab") as f:
+                    f.write(vectors.tobytes())
+                with open(self.signals_path, "a", encoding="utf-8") as f:
+                    for signal in kept:
+                        f.write(json.dumps(signal, default=str) + "\n")
+                matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(count, self.dim))
+            else:
+                if self._buffer is None or self._buffer.shape[0] < count:
+                    grown = np.empty((max(count, 2 * len(self.records), 1024), self.dim), dtype=np.float32)
+                    if self.records:
+                        grown[:len(self.records)] = self._matrix
+                    self._buffer = grown
+                self._buffer[len(self.records):count] = vectors
+                matrix = self._buffer[:count]
+
+            for signal in kept:
+                self._add_record(signal)
+            times = np.array([r.timestamp_us // 1_000_000 for r in self.records[-len(kept):]], dtype=np.int64)
+            self._times = np.concatenate([self._times, times])
+            self._matrix = matrix
+        return len(kept)
+
+    def search(self, query: List[float], k: int = 10,
+               since: Optional[datetime] = None) -> List[Tuple[float, Dict[str, Any]]]:
+        """Top-k signals by cosine similarity, newest-first on ties"""
+        with self._lock:
+            matrix, times, records = self._matrix, self._times, self.records
+        count = matrix.shape[0]
+        if count == 0 or k <= 0:
+            return []
+        vector = _normalize(np.asarray(query, dtype=np.float32))
+        if vector.shape[0] != self.dim:
+            raise ValueError(f"Query embedding size {vector.shape[0]} does not match index size {self.dim}")
+
+        scores = np.empty(count, dtype=np.float32)
+        for start in range(0, count, SEARCH_BLOCK_ROWS):
+            end = min(start + SEARCH_BLOCK_ROWS, count)
+            np.dot(matrix[start:end], vector, out=scores[start:end])
+        if since is not None:
+            scores[times[:count] < int(since.timestamp())] = -np.inf
+
+        k = min(k, count)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((-times[top], -scores[top]))]
+        return [(float(scores[i]), records[i].to_dict()) for i in top if np.isfinite(scores[i])]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "directory": self.directory,
+            "vectors": len(self.records),
+            "dimensions": self.dim,
+        }
@@ -0,0 +1,199 @@
+"""
+Server-side watchlists with push delivery
+Watchlists (stocks, event types, minimum confidence) are compiled into an
+inverted index keyed by stock and event, so each new signal is checked only
+against the watchlists that could match it. Matching signals are queued to
+that watchlist's live connections (SSE or WebSocket).
+"""
+
+import os
+import re
+import json
+import uuid
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional, Set, Iterable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WATCHLIST_FILE = os.getenv(
+    "WATCHLIST_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "watchlists.json"),
+)
+
+# Signals buffered per connection; a client that falls further behind loses the oldest
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+def normalize_key(value: Any) -> str:
+    """Case and punctuation insensitive key for stock names and event types"""
+    return re.sub(r"[^a-z0-9]", "", str(value).lower())
+
+
+class Watchlist:
+    """What one subscriber wants to hear about; empty stocks/events match anything"""
+
+    def __init__(self, stocks: Iterable[str] = (), events: Iterable[str] = (), min_confidence: int = 0,
+                 watchlist_id: Optional[str] = None):
+        self.id = watchlist_id or uuid.uuid4().hex[:12]
+        self.stocks = sorted({s for s in stocks if normalize_key(s)})
+        self.events = sorted({e for e in events if normalize_key(e)})
+        self.min_confidence = min_confidence
+        self.stock_keys = {normalize_key(s) for s in self.stocks}
+        self.event_keys = {normalize_key(e) for e in self.events}
+
+    def matches(self, stock_key: str, event_key: str, confidence: float) -> bool:
+        return ((not self.stock_keys or stock_key in self.stock_keys)
+                and (not self.event_keys or event_key in self.event_keys)
+                and confidence >= self.min_confidence)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "stocks": self.stocks,
+            "events": self.events,
+            "min_confidence": self.min_confidence,
+        }
+
+
+class Subscription:
+    """One live connection to a watchlist"""
+
+    def __init__(self, watchlist_id: str):
+        self.watchlist_id = watchlist_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.dropped = 0
+
+    def deliver(self, signal: Optional[Dict[str, Any]]):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(signal)
+
+    def close(self):
+        """Tell the connection to finish; it reads None from the queue"""
+        self.deliver(None)
+
+
+class WatchlistIndex:
+    """Watchlists indexed by stock and event for publish-time matching"""
+
+    def __init__(self, path: Optional[str] = DEFAULT_WATCHLIST_FILE):
+        self.path = path
+        self.watchlists: Dict[str, Watchlist] = {}
+        self.by_stock: Dict[str, Set[str]] = {}
+        self.by_event: Dict[str, Set[str]] = {}
+        # Watchlists without a stock (or event) filter
+        self.any_stock: Set[str] = set()
+        self.any_event: Set[str] = set()
+        self.subscriptions: Dict[str, Set[Subscription]] = {}
+        self.published = 0
+        self.delivered = 0
+        if path and os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                for data in json.load(f):
+                    self._index(Watchlist(data.get("stocks", []), data.get("events", []),
+                                          data.get("min_confidence", 0), data.get("id")))
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not load watchlists from {self.path}: {e}")
+
+    def _save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump([w.to_dict() for w in self.watchlists.values()], f)
+        os.replace(tmp_path, self.path)
+
+    def _index(self, watchlist: Watchlist):
+        self.watchlists[watchlist.id] = watchlist
+        for key in watchlist.stock_keys or [None]:
+            (self.by_stock.setdefault(key, set()) if key else self.any_stock).add(watchlist.id)
+        for key in watchlist.event_keys or [None]:
+            (self.by_event.setdefault(key, set()) if key else self.any_event).add(watchlist.id)
+
+    def _unindex(self, watchlist: Watchlist):
+        for keys, index, wildcard in ((watchlist.stock_keys, self.by_stock, self.any_stock),
+                                      (watchlist.event_keys, self.by_event, self.any_event)):
+            wildcard.discard(watchlist.id)
+            for key in keys:
+                ids = index.get(key)
+                if ids is not None:
+                    ids.discard(watchlist.id)
+                    if not ids:
+                        del index[key]
+
+    def add(self, watchlist: Watchlist) -> Watchlist:
+        self._index(watchlist)
+        self._save()
+        return watchlist
+
+    def remove(self, watchlist_id: str) -> bool:
+        watchlist = self.watchlists.pop(watchlist_id, None)
+        if watchlist is None:
+            return False
+        self._unindex(watchlist)
+        self._save()
+        for subscription in self.subscriptions.pop(watchlist_id, set()):
+            subscription.close()
+        return True
+
+    def get(self, watchlist_id: str) -> Optional[Watchlist]:
+        return self.watchlists.get(watchlist_id)
+
+    def match(self, signal: Dict[str, Any]) -> List[str]:
+        """Ids of watchlists the signal matches, looking only at candidates for its stock and event"""
+        stock_key = normalize_key(signal.get("stock", ""))
+        event_key = normalize_key(signal.get("event", ""))
+        try:
+            confidence = float(signal.get("confidence", 0))
+        except (TypeError, ValueError):
+            confidence = 0.0
+        by_stock = self.by_stock.get(stock_key, set())
+        by_event = self.by_event.get(event_key, set())
+        # Walk whichever side has fewer candidates; the other filter is checked per watchlist
+        if len(by_stock) + len(self.any_stock) <= len(by_event) + len(self.any_event):
+            candidates = (by_stock, self.any_stock)
+        else:
+            candidates = (by_event, self.any_event)
+        return [watchlist_id for ids in candidates for watchlist_id in ids
+                if self.watchlists[watchlist_id].matches(stock_key, event_key, confidence)]
+
+    def publish(self, signals: List[Dict[str, Any]]) -> int:
+        """Queue new signals to the connections of every matching watchlist"""
+        deliveries = 0
+        for signal in signals:
+            self.published += 1
+            for watchlist_id in self.match(signal):
+                for subscription in self.subscriptions.get(watchlist_id, ()):
+                    subscription.deliver(signal)
+                    deliveries += 1
+        self.delivered += deliveries
+        return deliveries
+
+    def subscribe(self, watchlist_id: str) -> Subscription:
+        subscription = Subscription(watchlist_id)
+        self.subscriptions.setdefault(watchlist_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self.subscriptions.get(subscription.watchlist_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self.subscriptions[subscription.watchlist_id]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "watchlists": len(self.watchlists),
+            "connections": sum(len(s) for s in self.subscriptions.values()),
+            "indexed_stocks": len(self.by_stock),
+            "indexed_events": len(self.by_event),
+            "published": self.published,
+            "delivered": self.delivered,
+        }
@@ -0,0 +1,192 @@
+"""
+Durable analysis work queue
+Headlines are written to a SQLite queue before they are analyzed and their
+results are written back keyed by GUID, so a restart neither loses items that
+were in flight nor pays for generations that had already finished. Jobs are
+processed at least once: leases left behind by a crash go back to pending
+when the next server process starts. Each job also records the analysis it
+last archived and pushed to watchlists, so that happens once per analysis
+however many cycles reuse it.
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Iterable
+
+from feed_reader import FeedItem
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_FILE = os.getenv(
+    "ANALYSIS_QUEUE_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "analysis_queue.db"),
+)
+
+# Finished jobs are kept this long so restarts and later polls reuse their results
+QUEUE_RETENTION_DAYS = float(os.getenv("QUEUE_RETENTION_DAYS", "7"))
+
+# Jobs that failed this many times are parked instead of retried every cycle
+QUEUE_MAX_ATTEMPTS = 5
+
+PENDING, LEASED, DONE, FAILED = "pending", "leased", "done", "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    guid TEXT PRIMARY KEY,
+    headline TEXT NOT NULL,
+    source TEXT,
+    link TEXT,
+    published TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    completed_at REAL,
+    result TEXT,
+    announced TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, enqueued_at);
+"""
+
+
+class WorkQueue:
+    """Analysis jobs keyed by item GUID; path=None keeps the queue in memory"""
+
+    def __init__(self, path: Optional[str] = DEFAULT_QUEUE_FILE):
+        self.path = os.path.abspath(path) if path else None
+        if self.path:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Opened at import but used from the event loop, one call at a time
+        self.db = sqlite3.connect(self.path or ":memory:", check_same_thread=False)
+        # WAL keeps commits cheap; NORMAL sync can lose the last commits on power
+        # loss but never corrupts, and a lost result is just redone
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(jobs)")}
+        if "announced" not in columns:
+            # Queues written before announcements were recorded
+            with self.db:
+                self.db.execute("ALTER TABLE jobs ADD COLUMN announced TEXT")
+        self.completed = 0
+        self.reused = 0
+        self.recovered = 0
+
+    def recover(self) -> int:
+        """Return jobs leased when the previous process stopped to pending
+
+        Called by the process that owns the queue when it starts, not on
+        open, so tools that merely import the app leave a live server's
+        leases alone.
+        """
+        self.recovered = self._release_leases()
+        if self.recovered:
+            logger.info(f"Recovered {self.recovered} unfinished analysis jobs from {self.path}")
+        return self.recovered
+
+    def _release_leases(self) -> int:
+        with self.db:
+            return self.db.execute("UPDATE jobs SET status = ? WHERE status = ?", (PENDING, LEASED)).rowcount
+
+    def enqueue(self, items: Iterable[FeedItem]) -> int:
+        """Persist items not queued before; returns how many were added"""
+        now = time.time()
+        rows = [(item.guid, item.title, item.source, item.link,
+                 item.published.isoformat() if item.published else None, PENDING, now)
+                for item in items]
+        with self.db:
+            before = self.db.total_changes
+            self.db.executemany(
+                "INSERT OR IGNORE INTO jobs (guid, headline, source, link, published, status, enqueued_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            return self.db.total_changes - before
+
+    def pending(self, limit: int, exclude: Iterable[str] = ()) -> List[FeedItem]:
+        """Oldest pending jobs as feed items, e.g. ones a restart interrupted"""
+        exclude = set(exclude)
+        cursor = self.db.execute(
+            "SELECT guid, headline, source, link, published FROM jobs WHERE status = ? ORDER BY enqueued_at",
+            (PENDING,))
+        items = []
+        for guid, headline, source, link, published in cursor:
+            if guid in exclude:
+                continue
+            items.append(FeedItem(guid, headline, link,
+                                  datetime.fromisoformat(published) if published else None, source))
+            if len(items) >= limit:
+                break
+        return items
+
+    def result(self, guid: str) -> Optional[Dict[str, Any]]:
+        """Stored analysis of a finished job"""
+        row = self.db.execute("SELECT result FROM jobs WHERE guid = ? AND status = ?", (guid, DONE)).fetchone()
+        if row is None:
+            return None
+        self.reused += 1
+        return json.loads(row[0])
+
+    def lease(self, guid: str) -> bool:
+        """Claim a queued job for analysis; False if it is finished, parked or unknown"""
+        with self.db:
+            return self.db.execute(
+                "UPDATE jobs SET status = ? WHERE guid = ? AND status = ?", (LEASED, guid, PENDING)).rowcount == 1
+
+    def complete(self, guid: str, analysis: Dict[str, Any]):
+        """Store a job's result; completing a job twice keeps one result"""
+        with self.db:
+            self.db.execute("UPDATE jobs SET status = ?, completed_at = ?, result = ? WHERE guid = ?",
+                            (DONE, time.time(), json.dumps(analysis, default=str), guid))
+        self.completed += 1
+
+    def announce(self, guid: str, analysis: Dict[str, Any]) -> bool:
+        """Record that a job's analysis was archived and published; False if it already was
+
+        A job whose analysis changes (a keyword fallback redone by a model)
+        is announced again. Unknown jobs are always announced.
+        """
+        digest = hashlib.sha1(json.dumps(analysis, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        with self.db:
+            row = self.db.execute("SELECT announced FROM jobs WHERE guid = ?", (guid,)).fetchone()
+            if row is not None and row[0] == digest:
+                return False
+            self.db.execute("UPDATE jobs SET announced = ? WHERE guid = ?", (digest, guid))
+        return True
+
+    def release(self, guid: str, failed: bool = False):
+        """Hand a leased job back for a later cycle
+
+        failed counts an attempt (no usable analysis); jobs are parked after
+        QUEUE_MAX_ATTEMPTS of those. Outages and shutdowns don't count.
+        """
+        with self.db:
+            self.db.execute(
+                "UPDATE jobs SET attempts = attempts + ?, "
+                "status = CASE WHEN attempts + ? >= ? THEN ? ELSE ? END WHERE guid = ? AND status = ?",
+                (int(failed), int(failed), QUEUE_MAX_ATTEMPTS, FAILED, PENDING, guid, LEASED))
+
+    def prune(self):
+        """Drop jobs queued before the retention period; their headlines are stale"""
+        cutoff = time.time() - QUEUE_RETENTION_DAYS * 86400
+        with self.db:
+            self.db.execute("DELETE FROM jobs WHERE status != ? AND enqueued_at < ?", (LEASED, cutoff))
+
+    def close(self):
+        """Checkpoint: jobs still leased are returned to pending for the next process"""
+        released = self._release_leases()
+        if released:
+            logger.info(f"Checkpointed {released} unfinished analysis jobs")
+        self.db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        counts = dict(self.db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {
+            "path": self.path,
+            **{status: counts.get(status, 0) for status in (PENDING, LEASED, DONE, FAILED)},
+            "recovered": self.recovered,
+            "completed": self.completed,
+            "reused": self.reused,
+        }
@@ -1,8 +1,9 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import axios from 'axios';
 import { RefreshCw, TrendingUp, AlertCircle } from 'lucide-react';
 
 interface Signal {
+  id: string;
   stock: string;
   event: string;
   sentiment: 'positive' | 'negative' | 'neutral';
@@ -16,25 +17,47 @@ interface Signal {
 interface ApiResponse {
   signals: Signal[];
   count: number;
+  version?: number;
   timestamp: string;
 }
 
+interface ChangesResponse {
+  version: number;
+  reset: boolean;
+  added: Signal[];
+  removed: string[];
+  timestamp: string;
+}
+
+const API_URL = 'http://localhost:8000';
+
+// Merge a delta from /signals/changes into the current list
+const applyChanges = (current: Signal[], changes: ChangesResponse): Signal[] => {
+  if (changes.reset) return changes.added;
+  const removed = new Set(changes.removed);
+  const updated = new Set(changes.added.map(s => s.id));
+  const kept = current.filter(s => !removed.has(s.id) && !updated.has(s.id));
+  return [...changes.added, ...kept];
+};
+
 const App: React.FC = () => {
   const [signals, setSignals] = useState<Signal[]>([]);
   const [loading, setLoading] = useState<boolean>(false);
   const [error, setError] = useState<string>('');
   const [lastUpdated, setLastUpdated] = useState<string>('');
   const [filter, setFilter] = useState<'all' | 'buy' | 'sell' | 'hold'>('all');
+  const versionRef = useRef<number>(0);
 
   const fetchSignals = async () => {
     setLoading(true);
     setError('');
     
     try {
-      const response = await axios.get<ApiResponse>('http://localhost:8000/signals', {
+      const response = await axios.get<ApiResponse>(`${API_URL}/signals`, {
         timeout: 30000
       });
       setSignals(response.data.signals);
+      versionRef.current = response.data.version ?? 0;
       setLastUpdated(new Date(response.data.timestamp).toLocaleTimeString());
     } catch (err: any) {
       if (err.code === 'ECONNABORTED') {
@@ -49,11 +72,43 @@ const App: React.FC = () => {
   };
 
   useEffect(() => {
-    fetchSignals();
-    
-    // Auto-refresh every 5 minutes
-    const interval = setInterval(fetchSignals, 5 * 60 * 1000);
-    return () => clearInterval(interval);
+    let cancelled = false;
+    let interval: ReturnType<typeof setInterval> | undefined;
+
+    // Long-poll for deltas so only changed signals cross the wire
+    const syncChanges = async () => {
+      while (!cancelled) {
+        try {
+          const response = await axios.get<ChangesResponse>(`${API_URL}/signals/changes`, {
+            params: { since: versionRef.current, timeout: 30 },
+            timeout: 45000
+          });
+          if (cancelled) return;
+          const changes = response.data;
+          if (changes.version !== versionRef.current || changes.reset) {
+            versionRef.current = changes.version;
+            setSignals(current => applyChanges(current, changes));
+            setLastUpdated(new Date(changes.timestamp).toLocaleTimeString());
+            setError('');
+          }
+        } catch (err: any) {
+          if (err.response?.status === 404) {
+            // Older backend without /signals/changes: poll the full list
+            fetchSignals();
+            interval = setInterval(fetchSignals, 5 * 60 * 1000);
+            return;
+          }
+          console.error('Error syncing signals:', err);
+          await new Promise(resolve => setTimeout(resolve, 5000));
+        }
+      }
+    };
+
+    syncChanges();
+    return () => {
+      cancelled = true;
+      if (interval) clearInterval(interval);
+    };
   }, []);
 
   const getSignalIcon = (signal: string) => {
@@ -184,7 +239,7 @@ const App: React.FC = () => {
           <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
             {filteredSignals.map((signal, index) => (
               <div
-                key={index}
+                key={signal.id ?? index}
                 className={`bg-white rounded-lg shadow-md border-2 p-6 ${getSignalColor(signal.signal)}`}
               >
                 <div className="flex justify-between items-start mb-4">
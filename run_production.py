@@ -1,20 +1,56 @@
 #!/usr/bin/env python3
 """
 Production runner for Stock News Analyzer
-Handles both demo mode and production mode with Ollama
+Handles demo mode, production mode with Ollama and simulator mode with the
+local Ollama API simulation. Services are launched together and each is
+reported up once its own readiness endpoint answers; Ollama models are
+pulled and loaded in the background while the backend already serves
+keyword-analyzed signals. A service that stops later is reported, and the
+runner exits if it was the backend.
 """
 
 import subprocess
+import threading
+import shutil
 import time
 import sys
 import os
 import requests
 import argparse
+from urllib.parse import urlparse
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(ROOT_DIR, 'backend')
+
+
+def ollama_url_from_env():
+    """First Ollama host from OLLAMA_URLS or OLLAMA_URL, read the way the backend reads them"""
+    value = os.getenv('OLLAMA_URLS') or os.getenv('OLLAMA_URL') or 'http://localhost:11434'
+    url = value.split(',')[0].strip().rstrip('/')
+    if url.endswith('/api/generate'):
+        url = url[:-len('/api/generate')]
+    return url
+
+
+OLLAMA_URL = ollama_url_from_env()
+SIMULATOR_PORT = 11435
+BACKEND_URL = 'http://localhost:8000'
+FRONTEND_PORT = 8080
+
+# Seconds a service may take to answer its readiness check
+READY_TIMEOUT = 60
+# Pulling a model can take a long time on a fresh machine
+MODEL_WARM_TIMEOUT = 1800
+# Readiness polls start fast and back off to this interval
+MAX_POLL_INTERVAL = 1.0
+
+KEYWORD_TIER = 'keyword'
+
 
 def check_ollama():
     """Check if Ollama is running and has Mistral model"""
     try:
-        response = requests.get('http://localhost:11434/api/tags', timeout=5)
+        response = requests.get(f'{OLLAMA_URL}/api/tags', timeout=5)
         if response.status_code == 200:
             models = response.json().get('models', [])
             has_mistral = any('mistral' in model.get('name', '') for model in models)
@@ -23,141 +59,270 @@ def check_ollama():
     except:
         return False, False
 
-def start_ollama():
-    """Start Ollama service"""
-    print("Starting Ollama service...")
-    try:
-        process = subprocess.Popen(['ollama', 'serve'], 
-                                 stdout=subprocess.DEVNULL, 
-                                 stderr=subprocess.DEVNULL)
-        time.sleep(5)
-        
-        # Check if it started successfully
-        running, has_model = check_ollama()
-        if running:
-            print("Ollama service started successfully!")
-            if not has_model:
-                print("Installing Mistral model...")
-                subprocess.run(['ollama', 'pull', 'mistral'], check=True)
-                print("Mistral model installed!")
-            return process
-        else:
-            print("Failed to start Ollama service")
-            return None
-    except Exception as e:
-        print(f"Error starting Ollama: {e}")
-        return None
-
-def start_backend(mode='demo'):
-    """Start the backend server"""
-    backend_dir = os.path.join(os.path.dirname(__file__), 'backend')
-    
-    if mode == 'production':
-        script = 'production_main.py'
-    else:
-        script = 'demo_main.py'
-    
-    print(f"Starting backend in {mode} mode...")
-    process = subprocess.Popen([sys.executable, script], cwd=backend_dir)
-    
-    # Wait for backend to start
-    time.sleep(3)
-    
-    # Test backend
-    try:
-        response = requests.get('http://localhost:8000/', timeout=5)
-        if response.status_code == 200:
-            print(f"Backend started successfully in {mode} mode!")
-            return process
-        else:
-            print(f"Backend responded with status: {response.status_code}")
-            return None
-    except:
-        print("Failed to connect to backend")
-        return None
-
-def start_frontend():
-    """Start the frontend demo server"""
-    print("Starting demo web server...")
-    process = subprocess.Popen([
-        sys.executable, '-m', 'http.server', '8080'
-    ], cwd=os.path.dirname(__file__))
-    time.sleep(2)
-    return process
+
+def wait_for(url, timeout=READY_TIMEOUT, process=None, check=None):
+    """Poll url with backoff until it returns 200 (and passes check); False on timeout or exit"""
+    started = time.time()
+    delay = 0.05
+    while time.time() - started < timeout:
+        if process is not None and process.poll() is not None:
+            return False
+        try:
+            response = requests.get(url, timeout=2)
+            if response.status_code == 200 and (check is None or check(response)):
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(delay)
+        delay = min(delay * 2, MAX_POLL_INTERVAL)
+    return False
+
+
+class Service:
+    """A launched process and the URL that says it is ready to serve"""
+
+    def __init__(self, name, command, ready_url, cwd=ROOT_DIR, env=None, check=None, timeout=READY_TIMEOUT):
+        self.name = name
+        self.command = command
+        self.ready_url = ready_url
+        self.cwd = cwd
+        self.env = env
+        self.check = check
+        self.timeout = timeout
+        self.process = None
+        self.started = None
+        self.ready_seconds = None
+        self.error = None
+        # Set once the readiness check has succeeded or failed
+        self.checked = threading.Event()
+
+    def start(self):
+        self.started = time.time()
+        # Output goes to this console (or the container log) as before
+        self.process = subprocess.Popen(self.command, cwd=self.cwd, env=self.env)
+        return self
+
+    def wait_ready(self):
+        try:
+            if wait_for(self.ready_url, self.timeout, self.process, self.check):
+                self.ready_seconds = time.time() - self.started
+                print(f"{self.name} ready in {self.ready_seconds:.1f}s")
+                return True
+            if self.process.poll() is not None:
+                self.error = f"exited with code {self.process.returncode}"
+            else:
+                self.error = f"not ready after {self.timeout}s"
+            print(f"{self.name} failed to start: {self.error}")
+            return False
+        finally:
+            self.checked.set()
+
+    def exited(self):
+        """True once the process has stopped; records its exit code as the error"""
+        if self.process.poll() is None:
+            return False
+        self.error = f"exited with code {self.process.returncode}"
+        return True
+
+    def stop(self):
+        try:
+            self.process.terminate()
+            self.process.wait(timeout=5)
+        except:
+            self.process.kill()
+
+
+def backend_healthy(response):
+    return response.json().get('status') == 'healthy'
+
+
+def ollama_service():
+    return Service('Ollama', ['ollama', 'serve'], f'{OLLAMA_URL}/api/tags')
+
+
+def simulator_service():
+    return Service('Ollama simulator',
+                   [sys.executable, '-m', 'uvicorn', 'ollama_server:app', '--port', str(SIMULATOR_PORT)],
+                   f'http://localhost:{SIMULATOR_PORT}/api/tags')
+
+
+def backend_service(mode='demo'):
+    env = dict(os.environ)
+    if mode == 'simulator':
+        env['OLLAMA_URLS'] = f"http://localhost:{SIMULATOR_PORT}"
+    return Service(f'Backend ({mode})', [sys.executable, 'start.py', '--mode', mode],
+                   f'{BACKEND_URL}/health', cwd=BACKEND_DIR, env=env, check=backend_healthy)
+
+
+def frontend_service():
+    return Service('Demo web server', [sys.executable, '-m', 'http.server', str(FRONTEND_PORT)],
+                   f'http://localhost:{FRONTEND_PORT}/demo.html')
+
+
+def ollama_models():
+    """Ollama models used by the backend's routing tiers"""
+    tiers = os.getenv('OLLAMA_MODEL_TIERS', 'mistral').split(',')
+    return [tier.strip() for tier in tiers if tier.strip() and tier.strip() != KEYWORD_TIER]
+
+
+def has_model(model):
+    response = requests.get(f'{OLLAMA_URL}/api/tags', timeout=5)
+    names = {m.get('name', '') for m in response.json().get('models', [])}
+    return model in names or f'{model}:latest' in names
+
+
+def ollama_is_local():
+    return urlparse(OLLAMA_URL).hostname in ('localhost', '127.0.0.1', '::1')
+
+
+def warm_models(ollama, timings):
+    """Wait for Ollama, pull missing models and run a first generation so they are loaded"""
+    if ollama is not None:
+        # main() runs the readiness check with the other services
+        ollama.checked.wait()
+        if ollama.ready_seconds is None:
+            print("Backend keeps using keyword analysis")
+            return
+    if ollama is None and not wait_for(f'{OLLAMA_URL}/api/tags', MODEL_WARM_TIMEOUT):
+        print(f"Ollama at {OLLAMA_URL} did not come up; backend keeps using keyword analysis")
+        return
+    started = time.time()
+    for model in ollama_models():
+        try:
+            if not has_model(model):
+                print(f"Pulling {model} model...")
+                requests.post(f'{OLLAMA_URL}/api/pull', json={'name': model, 'stream': False},
+                              timeout=MODEL_WARM_TIMEOUT).raise_for_status()
+            payload = {'model': model, 'prompt': 'Reply with OK.', 'stream': False,
+                       'keep_alive': os.getenv('OLLAMA_KEEP_ALIVE', '30m'), 'options': {'num_predict': 1}}
+            requests.post(f'{OLLAMA_URL}/api/generate', json=payload, timeout=MODEL_WARM_TIMEOUT).raise_for_status()
+            timings[f'{model} model'] = time.time() - started
+            print(f"{model} model warm in {time.time() - started:.1f}s")
+        except requests.RequestException as e:
+            print(f"Warm-up of {model} failed: {e}; backend keeps using keyword analysis")
+
+
+def watch_first_signal(started, timings):
+    """Record how long after launch the backend first has signals cached"""
+    def has_signals(response):
+        return response.json().get('count', 0) > 0
+    if wait_for(f'{BACKEND_URL}/signals/cached', MODEL_WARM_TIMEOUT, check=has_signals):
+        timings['first signal'] = time.time() - started
+        print(f"First signals available {timings['first signal']:.1f}s after launch")
+
+
+def in_background(target, *args):
+    thread = threading.Thread(target=target, args=args, daemon=True)
+    thread.start()
+    return thread
+
 
 def main():
     parser = argparse.ArgumentParser(description='Stock News Analyzer Runner')
-    parser.add_argument('--mode', choices=['demo', 'production'], default='demo',
-                       help='Run mode: demo (simulated) or production (with Ollama)')
+    parser.add_argument('--mode', choices=['demo', 'production', 'simulator'], default='demo',
+                       help='Run mode: demo (simulated), production (with Ollama) or '
+                            'simulator (sample headlines through a local Ollama simulation)')
     parser.add_argument('--no-ollama', action='store_true',
                        help='Skip Ollama setup (demo mode only)')
-    
+
     args = parser.parse_args()
-    
-    processes = []
-    
+
+    services = []
+    ollama = None
+    timings = {}
+    launched = time.time()
+
     try:
         if args.mode == 'production' and not args.no_ollama:
-            # Check and start Ollama
-            running, has_model = check_ollama()
-            if not running:
-                ollama_process = start_ollama()
-                if ollama_process:
-                    processes.append(ollama_process)
-                else:
-                    print("Failed to start Ollama. Falling back to demo mode.")
+            running, _ = check_ollama()
+            if not running and not ollama_is_local():
+                # Another host or container runs Ollama; the backend waits for it
+                print(f"Waiting for Ollama at {OLLAMA_URL}...")
+            elif not running:
+                if shutil.which('ollama') is None:
+                    print("Ollama is not installed. Falling back to demo mode.")
                     args.mode = 'demo'
-        
-        # Start backend
-        backend_process = start_backend(args.mode)
-        if backend_process:
-            processes.append(backend_process)
-        else:
+                else:
+                    print("Starting Ollama service...")
+                    ollama = ollama_service().start()
+                    services.append(ollama)
+
+        # Nothing below depends on anything else being up, so launch it all at once
+        if args.mode == 'simulator':
+            services.append(simulator_service().start())
+        backend = backend_service(args.mode).start()
+        services.append(backend)
+        services.append(frontend_service().start())
+        print(f"Starting {', '.join(s.name for s in services)}...")
+
+        if args.mode == 'production' and not args.no_ollama:
+            # The backend answers with keyword analysis until the models are loaded
+            in_background(warm_models, ollama, timings)
+        in_background(watch_first_signal, launched, timings)
+
+        waiters = [in_background(s.wait_ready) for s in services]
+        for waiter in waiters:
+            waiter.join()
+        if backend.ready_seconds is None:
             print("Failed to start backend")
+            for service in services:
+                service.stop()
             return 1
-        
-        # Start frontend
-        frontend_process = start_frontend()
-        if frontend_process:
-            processes.append(frontend_process)
-        
+
         print(f"\n{'='*60}")
         print(f"Stock News Analyzer is running in {args.mode.upper()} mode!")
         print(f"{'='*60}")
-        print(f"Backend API: http://localhost:8000")
-        print(f"Demo UI: http://localhost:8080/demo.html")
-        print(f"Health Check: http://localhost:8000/health")
-        
+        print(f"Backend API: {BACKEND_URL}")
+        print(f"Demo UI: http://localhost:{FRONTEND_PORT}/demo.html")
+        print(f"Health Check: {BACKEND_URL}/health")
+
         if args.mode == 'production':
-            print(f"Ollama API: http://localhost:11434")
+            print(f"Ollama API: {OLLAMA_URL}")
             print(f"Using real web scraping and AI analysis")
+        elif args.mode == 'simulator':
+            print(f"Ollama simulator: http://localhost:{SIMULATOR_PORT}")
+            print(f"Using sample headlines analyzed through the Ollama API")
         else:
             print(f"Using simulated data for demonstration")
-        
+
+        print(f"\nStartup times:")
+        for service in services:
+            status = f"{service.ready_seconds:.1f}s" if service.ready_seconds is not None else (service.error or "starting")
+            print(f"  {service.name}: {status}")
+        for name, seconds in timings.items():
+            print(f"  {name}: {seconds:.1f}s")
+
         print(f"\nAPI Endpoints:")
         print(f"  GET /signals - Get trading signals")
         print(f"  GET /signals/cached - Get cached signals")
         print(f"  GET /health - Health check")
         print(f"\nPress Ctrl+C to stop all services")
         print(f"{'='*60}")
-        
-        # Keep running until interrupted
+
+        # Keep running until interrupted or the backend stops
+        running = [s for s in services if s.error is None]
         while True:
             time.sleep(1)
-            
+            for service in [s for s in running if s.exited()]:
+                running.remove(service)
+                print(f"{service.name} stopped: {service.error}")
+            if backend not in running:
+                print("Backend stopped; shutting down the other services")
+                for service in running:
+                    service.stop()
+                return 1
+
     except KeyboardInterrupt:
         print("\nShutting down all services...")
-        for process in processes:
-            try:
-                process.terminate()
-                process.wait(timeout=5)
-            except:
-                process.kill()
+        for service in services:
+            service.stop()
         print("All services stopped.")
         return 0
     except Exception as e:
         print(f"Error: {e}")
+        for service in services:
+            service.stop()
         return 1
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())